@@ -3,6 +3,8 @@ import difflib
 from datetime import datetime
 import hashlib
 import logging
+import re
+from backend.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,7 @@ class ChangeDetector:
     def __init__(self):
         self.diff_matcher = difflib.SequenceMatcher(None)
         
+    @traced('diff.detect_changes')
     def detect_changes(self, old_text: str, new_text: str) -> Dict:
         """Analyze changes between two versions of text"""
         self.diff_matcher.set_seqs(old_text, new_text)
@@ -46,4 +49,59 @@ class ChangeDetector:
             'old_hash': hashlib.sha256(old_text.encode()).hexdigest(),
             'new_hash': hashlib.sha256(new_text.encode()).hexdigest(),
             'timestamp': datetime.utcnow().isoformat()
-        }
\ No newline at end of file
+        }
+    
+    @traced('diff.diff_opcodes')
+    def diff_opcodes(self, old_text: str, new_text: str) -> Dict:
+        """Compute a compact word-level diff as character ranges into both texts
+
+        Only non-equal opcodes are kept, so the result can be stored and later
+        expanded against the two versions without copying their text.
+        """
+        old_spans = [m.span() for m in re.finditer(r'\S+\s*', old_text)]
+        new_spans = [m.span() for m in re.finditer(r'\S+\s*', new_text)]
+        matcher = difflib.SequenceMatcher(
+            None,
+            [old_text[i:j] for i, j in old_spans],
+            [new_text[i:j] for i, j in new_spans],
+            autojunk=False
+        )
+        
+        def char_range(spans, start, end, text_length):
+            if start == end:
+                offset = spans[start][0] if start < len(spans) else text_length
+                return offset, offset
+            return spans[start][0], spans[end - 1][1]
+        
+        opcodes = []
+        chars_added = chars_removed = 0
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                continue
+            old_start, old_end = char_range(old_spans, i1, i2, len(old_text))
+            new_start, new_end = char_range(new_spans, j1, j2, len(new_text))
+            opcodes.append([tag, old_start, old_end, new_start, new_end])
+            chars_removed += old_end - old_start
+            chars_added += new_end - new_start
+            
+        return {
+            'similarity': matcher.ratio(),
+            'chars_added': chars_added,
+            'chars_removed': chars_removed,
+            'opcodes': opcodes
+        }
+    
+    def expand_opcodes(self, old_text: str, new_text: str, opcodes: List) -> Dict:
+        """Rebuild detect_changes-style additions/deletions/modifications from stored opcodes"""
+        changes = {'additions': [], 'deletions': [], 'modifications': []}
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag == 'insert':
+                changes['additions'].append(new_text[j1:j2])
+            elif tag == 'delete':
+                changes['deletions'].append(old_text[i1:i2])
+            elif tag == 'replace':
+                changes['modifications'].append({
+                    'old': old_text[i1:i2],
+                    'new': new_text[j1:j2]
+                })
+        return changes
\ No newline at end of file
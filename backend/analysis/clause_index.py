@@ -0,0 +1,303 @@
+from typing import Dict, List, Optional, Set
+from pathlib import Path
+from collections import defaultdict
+import os
+import re
+import fcntl
+import pickle
+import zlib
+import logging
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+def split_clauses(text: str, min_words: int = 15, max_words: int = 200) -> List[str]:
+    """Split document text into clause-sized chunks
+
+    Paragraph breaks are used when present; long paragraphs (and scraped text
+    that lost its line breaks) are regrouped sentence by sentence.
+    """
+    clauses = []
+    for paragraph in re.split(r'\n+', text):
+        sentences = re.split(r'(?<=[.;:])\s+', paragraph.strip())
+        chunk, chunk_words = [], 0
+        for sentence in sentences:
+            chunk.append(sentence)
+            chunk_words += len(sentence.split())
+            if chunk_words >= max_words:
+                clauses.append(' '.join(chunk))
+                chunk, chunk_words = [], 0
+        if chunk_words >= min_words:
+            clauses.append(' '.join(chunk))
+    return clauses
+
+class ClauseIndex:
+    """MinHash-LSH index for finding near-duplicate clauses across companies
+
+    Each clause is reduced to a MinHash signature over word shingles and the
+    signature is split into bands; clauses sharing any band bucket become
+    candidates, so a query only touches its own buckets rather than every
+    clause in the corpus. Documents changed since the index was loaded are
+    tracked so they can be merged into a newer copy saved by another process.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, shingle_size: int = 5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+
+        self.signatures: Dict[str, np.ndarray] = {}
+        self.metadata: Dict[str, Dict] = {}
+        self.document_clauses: Dict[str, Set[str]] = defaultdict(set)
+        self.buckets: List[Dict[bytes, Set[str]]] = [defaultdict(set) for _ in range(bands)]
+        self.dirty_documents: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def _shingles(self, text: str) -> Set[str]:
+        """Lower-cased word n-grams"""
+        words = re.findall(r'\w+', text.lower())
+        if len(words) <= self.shingle_size:
+            return {' '.join(words)} if words else set()
+        return {
+            ' '.join(words[i:i + self.shingle_size])
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Compute the MinHash signature for a piece of text"""
+        shingles = self._shingles(text)
+        if not shingles:
+            return None
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode()) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def add_clause(self, clause_id: str, text: str, metadata: Dict) -> bool:
+        """Add a single clause; returns False if it has no usable shingles"""
+        signature = self.signature(text)
+        if signature is None:
+            return False
+        with self._lock:
+            self._insert(clause_id, signature, metadata)
+        return True
+
+    def _insert(self, clause_id: str, signature: np.ndarray, metadata: Dict) -> None:
+        self.signatures[clause_id] = signature
+        self.metadata[clause_id] = metadata
+        self.document_clauses[metadata['document_id']].add(clause_id)
+        self.dirty_documents.add(metadata['document_id'])
+        for band, key in enumerate(self._band_keys(signature)):
+            self.buckets[band][key].add(clause_id)
+
+    def remove_document(self, document_id: str) -> None:
+        """Drop every clause previously indexed for a document"""
+        with self._lock:
+            self.dirty_documents.add(document_id)
+            for clause_id in self.document_clauses.pop(document_id, set()):
+                signature = self.signatures.pop(clause_id)
+                self.metadata.pop(clause_id, None)
+                for band, key in enumerate(self._band_keys(signature)):
+                    bucket = self.buckets[band].get(key)
+                    if bucket is not None:
+                        bucket.discard(clause_id)
+                        if not bucket:
+                            del self.buckets[band][key]
+
+    def add_version(self, version) -> int:
+        """Index the clauses of a DocumentVersion, replacing the document's older clauses"""
+        document = version.document
+        document_id = str(document.id)
+        self.remove_document(document_id)
+
+        added = 0
+        for position, clause in enumerate(split_clauses(version.content or '')):
+            added += self.add_clause(
+                f"{version.id}:{position}",
+                clause,
+                {
+                    'document_id': document_id,
+                    'document_version_id': str(version.id),
+                    'company_id': str(document.company_id),
+                    'document_type': document.document_type,
+                    'position': position,
+                    'text': clause[:500]
+                }
+            )
+        return added
+
+    def query(
+        self,
+        text: str,
+        threshold: float = 0.8,
+        exclude_company_id: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Dict]:
+        """Find indexed clauses whose estimated Jaccard similarity meets the threshold"""
+        signature = self.signature(text)
+        if signature is None:
+            return []
+
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self.buckets[band].get(key, ()))
+
+            matches = []
+            for clause_id in candidates:
+                meta = self.metadata[clause_id]
+                if exclude_company_id and meta['company_id'] == exclude_company_id:
+                    continue
+                similarity = float(np.mean(self.signatures[clause_id] == signature))
+                if similarity >= threshold:
+                    matches.append({'clause_id': clause_id, 'similarity': similarity, **meta})
+
+        matches.sort(key=lambda m: m['similarity'], reverse=True)
+        return matches[:limit]
+
+    def merge_documents(self, other: 'ClauseIndex', document_ids: Set[str]) -> None:
+        """Replace these documents' clauses with the ones held by another index"""
+        for document_id in document_ids:
+            self.remove_document(document_id)
+            with self._lock:
+                for clause_id in other.document_clauses.get(document_id, ()):
+                    self._insert(clause_id, other.signatures[clause_id], other.metadata[clause_id])
+
+    def save(self, path: str) -> None:
+        """Persist the index atomically"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with self._lock:
+            state = {
+                'num_perm': self.num_perm,
+                'bands': self.bands,
+                'shingle_size': self.shingle_size,
+                'a': self._a,
+                'b': self._b,
+                'signatures': self.signatures,
+                'metadata': self.metadata
+            }
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'ClauseIndex':
+        """Load a persisted index; buckets are rebuilt from the stored signatures"""
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+
+        index = cls(num_perm=state['num_perm'], bands=state['bands'], shingle_size=state['shingle_size'])
+        index._a = state['a']
+        index._b = state['b']
+        index.signatures = state['signatures']
+        index.metadata = state['metadata']
+        for clause_id, signature in index.signatures.items():
+            index.document_clauses[index.metadata[clause_id]['document_id']].add(clause_id)
+            for band, key in enumerate(index._band_keys(signature)):
+                index.buckets[band][key].add(clause_id)
+        return index
+
+_clause_index: Optional[ClauseIndex] = None
+_loaded_mtime: Optional[int] = None
+_reload_lock = threading.Lock()
+
+def _index_path() -> str:
+    return os.getenv("CLAUSE_INDEX_PATH", "data/clause_index.pkl")
+
+def _file_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def get_clause_index() -> ClauseIndex:
+    """Return the process-wide clause index, reloading it whenever CLAUSE_INDEX_PATH changes
+
+    Documents this process changed but has not saved yet are carried over
+    into the reloaded copy.
+    """
+    global _clause_index, _loaded_mtime
+    path = _index_path()
+    mtime = _file_mtime(path)
+    if _clause_index is not None and mtime == _loaded_mtime:
+        return _clause_index
+
+    with _reload_lock:
+        if _clause_index is None or mtime != _loaded_mtime:
+            fresh = None
+            if mtime is not None:
+                try:
+                    fresh = ClauseIndex.load(path)
+                except Exception as e:
+                    logger.error(f"Failed to load clause index from {path}: {str(e)}")
+            if fresh is None:
+                fresh = _clause_index or ClauseIndex()
+            elif _clause_index is not None and _clause_index.dirty_documents:
+                fresh.merge_documents(_clause_index, set(_clause_index.dirty_documents))
+            _clause_index = fresh
+            _loaded_mtime = mtime
+    return _clause_index
+
+def save_clause_index() -> None:
+    """Merge this process's changes into CLAUSE_INDEX_PATH under an exclusive file lock
+
+    Concurrent scrapers each save only the documents they changed on top of
+    the newest copy on disk, so one process never overwrites another's additions.
+    """
+    global _loaded_mtime
+    if _clause_index is None or not _clause_index.dirty_documents:
+        return
+    path = _index_path()
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{path}.lock", 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            index = get_clause_index()
+            index.save(path)
+            index.dirty_documents.clear()
+            _loaded_mtime = _file_mtime(path)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+if __name__ == "__main__":
+    from sqlalchemy.orm import joinedload
+    from backend.models import Document, DocumentVersion
+    from backend.utils.db import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        index = get_clause_index()
+        latest = (
+            db.query(DocumentVersion)
+            .join(Document, Document.current_version_id == DocumentVersion.id)
+            .options(joinedload(DocumentVersion.document))
+            .yield_per(200)
+        )
+        clauses = sum(index.add_version(version) for version in latest)
+        save_clause_index()
+        logger.info(f"Rebuilt clause index with {clauses} clauses")
+    finally:
+        db.close()
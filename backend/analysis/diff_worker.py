@@ -0,0 +1,85 @@
+from typing import Optional
+import asyncio
+import logging
+from sqlalchemy.orm import joinedload
+from backend.models import VersionChange
+from backend.utils.clock import utcnow
+from backend.utils.db import SessionLocal
+from backend.utils.tracing import span, profile_job
+from .change_detector import ChangeDetector
+
+logger = logging.getLogger(__name__)
+
+class DiffWorker:
+    """Background worker that drains the version change feed
+
+    Each pending VersionChange is diffed exactly once and stored as opcode
+    ranges, so history endpoints never run the diff on the request path.
+    Rows are claimed with SKIP LOCKED, so several workers can run side by side.
+    """
+
+    def __init__(self, batch_size: int = 20, poll_interval: float = 5.0):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.detector = ChangeDetector()
+
+    def process_pending(self, db=None) -> int:
+        """Diff one batch of pending changes and return how many were processed"""
+        owns_session = db is None
+        db = db or SessionLocal()
+        try:
+            with profile_job("diff-batch"), span('diff.batch', log_summary=True):
+                return self._process_batch(db)
+        except Exception as e:
+            logger.error(f"Diff batch failed: {str(e)}")
+            db.rollback()
+            return 0
+        finally:
+            if owns_session:
+                db.close()
+
+    def _process_batch(self, db) -> int:
+        changes = (
+            db.query(VersionChange)
+            .options(
+                joinedload(VersionChange.old_version, innerjoin=True),
+                joinedload(VersionChange.new_version, innerjoin=True)
+            )
+            .filter(VersionChange.status == 'pending')
+            .order_by(VersionChange.created_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True, of=VersionChange)
+            .all()
+        )
+        for change in changes:
+            self._process(change)
+        with span('db.commit'):
+            db.commit()
+        return len(changes)
+
+    def _process(self, change: VersionChange) -> None:
+        try:
+            diff = self.detector.diff_opcodes(change.old_version.content, change.new_version.content)
+            change.similarity = round(diff['similarity'], 4)
+            change.chars_added = diff['chars_added']
+            change.chars_removed = diff['chars_removed']
+            change.opcodes = diff['opcodes']
+            change.status = 'done'
+        except Exception as e:
+            logger.error(f"Diff failed for version {change.new_version_id}: {str(e)}")
+            change.status = 'failed'
+            change.error = str(e)
+        change.processed_at = utcnow()
+
+    async def run(self, max_batches: Optional[int] = None) -> None:
+        """Poll the change feed until cancelled, sleeping only when it is empty"""
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            processed = await asyncio.to_thread(self.process_pending)
+            batches += 1
+            if processed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(DiffWorker().run())
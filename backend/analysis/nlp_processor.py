@@ -3,6 +3,7 @@ import spacy
 import textstat
 from transformers import pipeline
 import logging
+from backend.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +14,7 @@ class NLPProcessor:
         self.nlp = spacy.load("en_core_web_md")
         self.sentiment_analyzer = pipeline("sentiment-analysis")
         
+    @traced('nlp.analyze_text')
     def analyze_text(self, text: str) -> Dict:
         """Perform comprehensive NLP analysis on text"""
         doc = self.nlp(text)
@@ -1,8 +1,10 @@
 from fastapi import FastAPI, Depends
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from .routes import companies, documents, analysis
+from .routes import companies, documents, analysis, search, comparisons
 from .auth import auth_router, get_current_user
 from .middleware.logging import LoggingMiddleware
+from backend.utils.tracing import metrics
 import logging
 
 logger = logging.getLogger(__name__)
@@ -44,4 +46,21 @@ app.include_router(
     prefix="/analysis",
     tags=["Analysis"],
     dependencies=[Depends(get_current_user)]
-)
\ No newline at end of file
+)
+app.include_router(
+    search.router,
+    prefix="/search",
+    tags=["Search"],
+    dependencies=[Depends(get_current_user)]
+)
+app.include_router(
+    comparisons.router,
+    prefix="/compare",
+    tags=["Comparisons"],
+    dependencies=[Depends(get_current_user)]
+)
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Request and pipeline span latencies in Prometheus text format"""
+    return metrics.render_prometheus()
\ No newline at end of file
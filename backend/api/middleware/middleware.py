@@ -2,6 +2,7 @@ from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 import logging
 import time
+from backend.utils.tracing import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +13,11 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
         
         process_time = time.time() - start_time
+        route = request.scope.get('route')
+        metrics.observe(
+            f"http {request.method} {route.path if route else 'unmatched'}",
+            process_time
+        )
         logger.info(
             f"{request.method} {request.url.path} "
             f"completed in {process_time:.3f}s "
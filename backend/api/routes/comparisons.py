@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from ..schemas.schemas import CompanyComparison
+from backend.models import Company, CompanyScoreAggregate
+from backend.utils.db import get_db
+
+router = APIRouter()
+
+MAX_COMPARED_COMPANIES = 50
+
+@router.get("/", response_model=List[CompanyComparison])
+async def compare_companies(
+    company_ids: List[str] = Query(...),
+    document_type: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Compare companies side by side using precomputed score aggregates"""
+    if len(company_ids) > MAX_COMPARED_COMPANIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_COMPARED_COMPANIES} companies can be compared"
+        )
+
+    query = db.query(CompanyScoreAggregate, Company.name).join(
+        Company, Company.id == CompanyScoreAggregate.company_id
+    ).filter(CompanyScoreAggregate.company_id.in_(company_ids))
+    if document_type:
+        query = query.filter(CompanyScoreAggregate.document_type == document_type)
+
+    comparisons = {company_id: None for company_id in company_ids}
+    for aggregate, name in query.all():
+        company_id = str(aggregate.company_id)
+        if comparisons.get(company_id) is None:
+            comparisons[company_id] = {'company_id': company_id, 'name': name, 'documents': []}
+        comparisons[company_id]['documents'].append({
+            'document_type': aggregate.document_type,
+            'document_count': aggregate.document_count,
+            'overall_score': aggregate.overall_score,
+            'complexity_score': aggregate.complexity_score,
+            'readability_score': aggregate.readability_score,
+            'sentiment_score': aggregate.sentiment_score,
+            'confidence_level': aggregate.confidence_level,
+            'version_count': aggregate.version_count,
+            'changes_last_90_days': aggregate.changes_last_90_days,
+            'last_changed_at': aggregate.last_changed_at,
+            'last_analyzed_at': aggregate.last_analyzed_at
+        })
+
+    # Preserve the requested order; companies without analysed documents are omitted
+    return [comparison for comparison in comparisons.values() if comparison]
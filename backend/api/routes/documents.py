@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session, load_only
+from typing import List
+from ..schemas.schemas import VersionHistoryEntry, VersionChangeDetail
+from backend.models import DocumentVersion, VersionChange
+from backend.analysis.change_detector import ChangeDetector
+from backend.utils.db import get_db
+
+router = APIRouter()
+
+@router.get("/{document_id}/history", response_model=List[VersionHistoryEntry])
+async def get_document_history(document_id: str, db: Session = Depends(get_db)):
+    """Version timeline with precomputed change summaries, newest first"""
+    versions = db.query(DocumentVersion).options(
+        load_only(
+            DocumentVersion.id,
+            DocumentVersion.version_number,
+            DocumentVersion.extracted_at,
+            DocumentVersion.word_count
+        )
+    ).filter(
+        DocumentVersion.document_id == document_id
+    ).order_by(DocumentVersion.version_number.desc()).all()
+    if not versions:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    changes = {
+        change.new_version_id: change
+        for change in db.query(VersionChange).options(
+            load_only(
+                VersionChange.new_version_id,
+                VersionChange.status,
+                VersionChange.similarity,
+                VersionChange.chars_added,
+                VersionChange.chars_removed
+            )
+        ).filter(VersionChange.document_id == document_id)
+    }
+
+    history = []
+    for version in versions:
+        change = changes.get(version.id)
+        history.append({
+            'version_id': str(version.id),
+            'version_number': version.version_number,
+            'extracted_at': version.extracted_at,
+            'word_count': version.word_count,
+            'change': {
+                'status': change.status,
+                'similarity': change.similarity,
+                'chars_added': change.chars_added,
+                'chars_removed': change.chars_removed
+            } if change else None
+        })
+    return history
+
+@router.get("/{document_id}/changes/{version_id}", response_model=VersionChangeDetail)
+async def get_version_change(document_id: str, version_id: str, db: Session = Depends(get_db)):
+    """Changes introduced by a version, expanded from the stored opcode ranges"""
+    change = db.query(VersionChange).filter(
+        VersionChange.document_id == document_id,
+        VersionChange.new_version_id == version_id
+    ).first()
+    if not change:
+        raise HTTPException(status_code=404, detail="No change recorded for this version")
+
+    detail = {
+        'status': change.status,
+        'similarity': change.similarity,
+        'chars_added': change.chars_added,
+        'chars_removed': change.chars_removed,
+        'old_version_id': str(change.old_version_id),
+        'new_version_id': str(change.new_version_id)
+    }
+    if change.status == 'done':
+        detail.update(ChangeDetector().expand_opcodes(
+            change.old_version.content,
+            change.new_version.content,
+            change.opcodes
+        ))
+    return detail
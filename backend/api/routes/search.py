@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import time
+from ..schemas.schemas import SearchResults, SimilarClauseQuery, SimilarClause
+from backend.search import get_search_backend
+from backend.analysis.clause_index import get_clause_index
+from backend.utils.db import get_db
+
+router = APIRouter()
+
+@router.get("/", response_model=SearchResults)
+async def search_documents(
+    q: str = Query(..., min_length=2),
+    company_id: Optional[str] = None,
+    document_type: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Full-text search over the current version of every document"""
+    start_time = time.perf_counter()
+    results = get_search_backend(db).search(
+        q,
+        company_id=company_id,
+        document_type=document_type,
+        page=page,
+        page_size=page_size
+    )
+    results['query_time_ms'] = round((time.perf_counter() - start_time) * 1000, 2)
+    return results
+
+
+@router.post("/similar-clauses", response_model=List[SimilarClause])
+async def find_similar_clauses(query: SimilarClauseQuery):
+    """Find near-duplicate clauses across all companies"""
+    return get_clause_index().query(
+        query.text,
+        threshold=query.threshold,
+        exclude_company_id=query.exclude_company_id,
+        limit=query.limit
+    )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, HttpUrl
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 class CompanyBase(BaseModel):
@@ -21,4 +21,74 @@ class Company(CompanyBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class SearchHit(BaseModel):
+    document_id: str
+    document_version_id: str
+    company_id: str
+    document_type: str
+    title: Optional[str] = None
+    score: float
+    snippet: Optional[str] = None
+
+class SearchResults(BaseModel):
+    total: int
+    page: int
+    page_size: int
+    results: List[SearchHit]
+    query_time_ms: float
+
+class SimilarClauseQuery(BaseModel):
+    text: str
+    threshold: float = 0.8
+    exclude_company_id: Optional[str] = None
+    limit: int = 50
+
+class SimilarClause(BaseModel):
+    clause_id: str
+    similarity: float
+    document_id: str
+    document_version_id: str
+    company_id: str
+    document_type: str
+    position: int
+    text: str
+
+class DocumentTypeAggregate(BaseModel):
+    document_type: str
+    document_count: int
+    overall_score: Optional[float] = None
+    complexity_score: Optional[float] = None
+    readability_score: Optional[float] = None
+    sentiment_score: Optional[float] = None
+    confidence_level: Optional[float] = None
+    version_count: int
+    changes_last_90_days: int
+    last_changed_at: Optional[datetime] = None
+    last_analyzed_at: Optional[datetime] = None
+
+class CompanyComparison(BaseModel):
+    company_id: str
+    name: str
+    documents: List[DocumentTypeAggregate]
+
+class ChangeSummary(BaseModel):
+    status: str
+    similarity: Optional[float] = None
+    chars_added: Optional[int] = None
+    chars_removed: Optional[int] = None
+
+class VersionHistoryEntry(BaseModel):
+    version_id: str
+    version_number: int
+    extracted_at: Optional[datetime] = None
+    word_count: Optional[int] = None
+    change: Optional[ChangeSummary] = None
+
+class VersionChangeDetail(ChangeSummary):
+    old_version_id: str
+    new_version_id: str
+    additions: List[str] = []
+    deletions: List[str] = []
+    modifications: List[Dict[str, str]] = []
\ No newline at end of file
@@ -0,0 +1,235 @@
+from typing import Callable, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+import argparse
+import json
+import logging
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from backend.utils.test_data import generate_corpus
+from .stats import latency_summary
+
+logger = logging.getLogger(__name__)
+
+# Records the classifier is trained on before the classify stage is timed
+TRAINING_RECORDS = 200
+
+def _nlp_stage(corpus_options: Dict) -> Callable:
+    from backend.analysis.nlp_processor import NLPProcessor
+    processor = NLPProcessor()
+    return lambda record, previous: processor.analyze_text(record['content'])
+
+def _classify_stage(corpus_options: Dict) -> Callable:
+    from backend.analysis.document_classifier import DocumentClassifier
+    classifier = DocumentClassifier()
+    training = list(islice(generate_corpus(**corpus_options), TRAINING_RECORDS))
+    classifier.train([r['content'] for r in training], [r['document_type'] for r in training])
+    return lambda record, previous: classifier.classify_document(record['content'])
+
+def _score_stage(corpus_options: Dict) -> Callable:
+    from backend.analysis.clause_scorer import ClauseScorer
+    from backend.analysis.clause_index import split_clauses
+    scorer = ClauseScorer()
+
+    # score_clause raises until clarity, fairness and privacy impact are
+    # implemented, so only the implemented criterion is timed
+    def score(record, previous):
+        for clause in split_clauses(record['content']):
+            scorer._assess_restrictiveness(clause)
+    return score
+
+def _diff_stage(corpus_options: Dict) -> Callable:
+    from backend.analysis.change_detector import ChangeDetector
+    detector = ChangeDetector()
+    return lambda record, previous: detector.detect_changes(previous['content'], record['content'])
+
+def _diff_opcodes_stage(corpus_options: Dict) -> Callable:
+    from backend.analysis.change_detector import ChangeDetector
+    detector = ChangeDetector()
+    return lambda record, previous: detector.diff_opcodes(previous['content'], record['content'])
+
+def _clause_index_stage(corpus_options: Dict) -> Callable:
+    from backend.analysis.clause_index import ClauseIndex, split_clauses
+    index = ClauseIndex()
+
+    def add_and_query(record, previous):
+        key = f"{record['document_key']}:{record['version']}"
+        for position, clause in enumerate(split_clauses(record['content'])):
+            index.add_clause(f"{key}:{position}", clause, {'document_id': key, 'company_id': record['company']})
+            index.query(clause)
+    return add_and_query
+
+# name -> (setup, needs_previous_version); setups get the corpus options and
+# generate whatever they need up front, the measured loop streams the corpus
+STAGES = {
+    'nlp': (_nlp_stage, False),
+    'classify': (_classify_stage, False),
+    'score': (_score_stage, False),
+    'diff': (_diff_stage, True),
+    'diff_opcodes': (_diff_opcodes_stage, True),
+    'clause_index': (_clause_index_stage, False)
+}
+
+def _rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def run_stage(stage: str, corpus_options: Dict, limit: Optional[int] = None) -> Dict:
+    """Benchmark a single stage over the synthetic corpus
+
+    The corpus is streamed, so peak RSS reflects the stage rather than the corpus size.
+    """
+    rss_before = _rss_mb()
+
+    setup, needs_previous = STAGES[stage]
+    setup_start = time.perf_counter()
+    step = setup(corpus_options)
+    setup_time = time.perf_counter() - setup_start
+
+    records = generate_corpus(**corpus_options)
+    last = None
+    latencies, errors, chars = [], 0, 0
+    generation_wall = generation_cpu = 0.0
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    while True:
+        # Generating the next record is not part of the stage; keep it out of wall and CPU time
+        generation_start, generation_cpu_start = time.perf_counter(), time.process_time()
+        record = next(records, None)
+        generation_wall += time.perf_counter() - generation_start
+        generation_cpu += time.process_time() - generation_cpu_start
+        if record is None:
+            break
+        # A document's versions are generated consecutively, so only the last record is kept
+        previous = last if last is not None and last['document_key'] == record['document_key'] else None
+        last = record
+        if needs_previous and previous is None:
+            continue
+        if limit is not None and len(latencies) >= limit:
+            break
+
+        start = time.perf_counter()
+        try:
+            step(record, previous)
+        except Exception as e:
+            errors += 1
+            if errors == 1:
+                logger.error(f"Stage {stage} failed: {str(e)}")
+        latencies.append(time.perf_counter() - start)
+        chars += len(record['content'])
+    wall = time.perf_counter() - wall_start - generation_wall
+    cpu = time.process_time() - cpu_start - generation_cpu
+
+    return {
+        'items': len(latencies),
+        'errors': errors,
+        'items_per_sec': round(len(latencies) / wall, 2) if wall else 0.0,
+        'mb_per_sec': round(chars / wall / 1e6, 3) if wall else 0.0,
+        'cpu_s': round(cpu, 3),
+        'wall_s': round(wall, 3),
+        'setup_s': round(setup_time, 3),
+        'latency': latency_summary(latencies),
+        'rss_before_mb': rss_before,
+        'peak_rss_mb': _rss_mb()
+    }
+
+def run_benchmarks(stages: List[str], corpus_options: Dict, limit: Optional[int] = None,
+                   isolate: bool = True) -> Dict:
+    """Run each stage, by default in a fresh process so peak RSS is per stage"""
+    results = {}
+    for stage in stages:
+        if isolate:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                results[stage] = executor.submit(run_stage, stage, corpus_options, limit).result()
+        else:
+            results[stage] = run_stage(stage, corpus_options, limit)
+    return {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'corpus': corpus_options,
+            'limit': limit
+        },
+        'stages': results
+    }
+
+# metric path -> True if higher is better
+COMPARED_METRICS = {
+    ('items_per_sec',): True,
+    ('latency', 'p99_ms'): False,
+    ('peak_rss_mb',): False
+}
+
+def compare_to_baseline(results: Dict, baseline: Dict, tolerance: float = 0.10) -> List[str]:
+    """Return human-readable regressions of results against a stored baseline"""
+    regressions = []
+    for stage, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous:
+            continue
+        for path, higher_is_better in COMPARED_METRICS.items():
+            old, new = previous, current
+            for key in path:
+                old, new = old[key], new[key]
+            if not old:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{stage} {'.'.join(path)}: {old} -> {new} ({change:+.1%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the analysis pipeline over a synthetic policy corpus",
+        epilog="e.g. python -m backend.benchmarks.analysis_bench --stages diff score --compare baseline.json"
+    )
+    parser.add_argument('--stages', nargs='+', default=list(STAGES), choices=list(STAGES))
+    parser.add_argument('--companies', type=int, default=50)
+    parser.add_argument('--documents-per-company', type=int, default=3)
+    parser.add_argument('--versions', type=int, default=3)
+    parser.add_argument('--edit-rate', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--limit', type=int, help="Max items per stage (useful for slow NLP stages)")
+    parser.add_argument('--no-isolate', action='store_true', help="Run all stages in this process")
+    parser.add_argument('--save-baseline', metavar='PATH', help="Write results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="Compare against a JSON baseline")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    corpus_options = {
+        'num_companies': args.companies,
+        'documents_per_company': args.documents_per_company,
+        'versions_per_document': args.versions,
+        'edit_rate': args.edit_rate,
+        'seed': args.seed
+    }
+    results = run_benchmarks(args.stages, corpus_options, limit=args.limit, isolate=not args.no_isolate)
+
+    print(f"{'stage':<14} {'items':>6} {'err':>5} {'items/s':>9} {'MB/s':>7} "
+          f"{'p50 ms':>9} {'p99 ms':>9} {'peak MB':>8}")
+    for stage, r in results['stages'].items():
+        print(f"{stage:<14} {r['items']:>6} {r['errors']:>5} {r['items_per_sec']:>9} {r['mb_per_sec']:>7} "
+              f"{r['latency']['p50_ms']:>9} {r['latency']['p99_ms']:>9} {r['peak_rss_mb']:>8}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
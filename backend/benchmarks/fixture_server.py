@@ -0,0 +1,77 @@
+from typing import Optional
+from pathlib import Path
+import asyncio
+import random
+import logging
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+def fixture_path(scraper: str, path: str) -> Path:
+    """Map a request path under a scraper prefix to its recorded HTML file"""
+    name = path.strip('/').replace('/', '__') or 'index'
+    return FIXTURES_DIR / scraper / f"{name}.html"
+
+class FixtureServer:
+    """Local aiohttp stand-in that replays recorded policy pages
+
+    Pages are served from fixtures/<scraper>/, with request paths taken
+    relative to path_prefix (the path of the scraper's BASE_URL), plus
+    configurable latency and a rate of injected 429 responses.
+    """
+
+    def __init__(
+        self,
+        scraper: str,
+        path_prefix: str = '',
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.scraper = scraper
+        self.path_prefix = path_prefix.rstrip('/')
+        self.requests_served = 0
+        self.throttled = 0
+        self._runner = None
+        self.base_url = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.throttled += 1
+            return web.Response(status=429, headers={'Retry-After': '1'})
+
+        if not request.path.startswith(self.path_prefix):
+            return web.Response(status=404)
+        path = fixture_path(self.scraper, request.path[len(self.path_prefix):])
+        if not path.exists():
+            return web.Response(status=404)
+        self.requests_served += 1
+        return web.Response(body=path.read_bytes(), content_type='text/html')
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start serving and return the base URL"""
+        app = web.Application()
+        app.router.add_get('/{path:.*}', self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
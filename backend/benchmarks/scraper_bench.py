@@ -0,0 +1,213 @@
+from typing import Dict, List, Optional, Type
+from dataclasses import dataclass, field
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import time
+from urllib.parse import urlsplit
+from backend.scrapers.base import BaseScraper
+from backend.scrapers.sites import GoogleScraper, MicrosoftScraper, AppleScraper
+from .fixture_server import FixtureServer, fixture_path
+from .stats import percentile
+
+logger = logging.getLogger(__name__)
+
+SCRAPERS: Dict[str, Type[BaseScraper]] = {
+    'google': GoogleScraper,
+    'microsoft': MicrosoftScraper,
+    'apple': AppleScraper
+}
+
+# MicrosoftScraper is still a stub that discovers nothing, so it is only
+# benchmarked when asked for explicitly and its result is flagged
+STUB_SCRAPERS = {'microsoft'}
+DEFAULT_SCRAPERS = [name for name in SCRAPERS if name not in STUB_SCRAPERS]
+
+# Landing pages each scraper's get_document_urls starts from, relative to BASE_URL
+LANDING_PATHS = {
+    'google': '/terms',
+    'microsoft': '/',
+    'apple': '/'
+}
+
+@dataclass
+class ScraperStats:
+    documents: int = 0
+    fetches: int = 0
+    failed_fetches: int = 0
+    parse_errors: int = 0
+    bytes: int = 0
+    parse_cpu: float = 0.0
+    fetch_cpu: float = 0.0
+    elapsed: float = 0.0
+    fetch_latencies: List[float] = field(default_factory=list)
+
+    def report(self) -> Dict:
+        return {
+            'documents': self.documents,
+            'documents_per_sec': round(self.documents / self.elapsed, 2) if self.elapsed else 0.0,
+            'fetches': self.fetches,
+            'failed_fetches': self.failed_fetches,
+            'parse_errors': self.parse_errors,
+            'bytes': self.bytes,
+            'parse_cpu_ms': round(self.parse_cpu * 1000, 2),
+            'fetch_p50_ms': round(percentile(self.fetch_latencies, 50) * 1000, 2),
+            'fetch_p99_ms': round(percentile(self.fetch_latencies, 99) * 1000, 2),
+            'elapsed_s': round(self.elapsed, 3)
+        }
+
+def instrumented(scraper_class: Type[BaseScraper], base_url: str, stats: ScraperStats,
+                 rate_limited: bool = False) -> Type[BaseScraper]:
+    """Subclass a scraper so it targets the fixture server and records fetch timings
+
+    The production 1 req/s limiter is bypassed unless rate_limited is set, so
+    the benchmark measures the scraper rather than the limiter.
+    """
+    request = BaseScraper._request if rate_limited else inspect.unwrap(BaseScraper._request)
+
+    class BenchmarkScraper(scraper_class):
+        BASE_URL = base_url
+
+        async def _request(self, url: str, headers: Optional[Dict] = None, binary: bool = False) -> Dict:
+            start_wall, start_cpu = time.perf_counter(), time.thread_time()
+            response = await request(self, url, headers, binary)
+            stats.fetch_latencies.append(time.perf_counter() - start_wall)
+            stats.fetch_cpu += time.thread_time() - start_cpu
+            stats.fetches += 1
+            if response['content']:
+                content = response['content']
+                stats.bytes += len(content.encode() if isinstance(content, str) else content)
+            else:
+                stats.failed_fetches += 1
+            return response
+
+    BenchmarkScraper.__name__ = f"Benchmark{scraper_class.__name__}"
+    return BenchmarkScraper
+
+async def _timed_parse(stats: ScraperStats, step):
+    """Await a scraper step, charging its CPU time minus time spent fetching to parsing"""
+    start_cpu, start_fetch_cpu = time.thread_time(), stats.fetch_cpu
+    try:
+        return await step
+    except Exception as e:
+        stats.parse_errors += 1
+        logger.error(f"Parse failed: {str(e)}")
+        return None
+    finally:
+        stats.parse_cpu += (time.thread_time() - start_cpu) - (stats.fetch_cpu - start_fetch_cpu)
+
+async def bench_scraper(name: str, server: FixtureServer, repeat: int = 1, rate_limited: bool = False) -> Dict:
+    """Run one scraper's discovery and extraction against its fixture server"""
+    stats = ScraperStats()
+    scraper_class = instrumented(SCRAPERS[name], f"{server.base_url}{server.path_prefix}", stats, rate_limited)
+    scraper = scraper_class(company_id='benchmark')
+    try:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            urls = await _timed_parse(stats, scraper.get_document_urls()) or []
+            for url in urls:
+                if await _timed_parse(stats, scraper.extract_document_content(url)):
+                    stats.documents += 1
+        stats.elapsed = time.perf_counter() - start
+    finally:
+        await scraper.session.close()
+        scraper.db.close()
+    return stats.report()
+
+async def run_benchmarks(
+    scrapers: List[str],
+    repeat: int = 1,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    rate_limited: bool = False,
+    seed: Optional[int] = 0
+) -> Dict[str, Dict]:
+    """Benchmark each scraper in turn against its own fixture server"""
+    results = {}
+    for name in scrapers:
+        server = FixtureServer(
+            name,
+            path_prefix=urlsplit(SCRAPERS[name].BASE_URL).path,
+            latency_ms=latency_ms,
+            jitter_ms=jitter_ms,
+            error_rate=error_rate,
+            seed=seed
+        )
+        await server.start()
+        try:
+            results[name] = await bench_scraper(name, server, repeat=repeat, rate_limited=rate_limited)
+            results[name]['throttled'] = server.throttled
+            results[name]['stub'] = name in STUB_SCRAPERS
+        finally:
+            await server.stop()
+    return results
+
+async def record_fixtures(name: str) -> int:
+    """Fetch a scraper's live landing and policy pages into the fixtures directory"""
+    scraper = SCRAPERS[name](company_id='benchmark')
+    base_url = scraper.BASE_URL
+    try:
+        urls = [f"{base_url}{LANDING_PATHS[name]}"] + list(await scraper.get_document_urls() or [])
+        saved = 0
+        for url in urls:
+            if not url.startswith(base_url):
+                logger.info(f"Skipping off-site URL {url}")
+                continue
+            content = await scraper.fetch_page(url)
+            if not content:
+                continue
+            path = fixture_path(name, url[len(base_url):].split('?')[0])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+            saved += 1
+        return saved
+    finally:
+        await scraper.session.close()
+        scraper.db.close()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay recorded policy pages through the scrapers and report throughput",
+        epilog="e.g. python -m backend.benchmarks.scraper_bench --latency-ms 50 --error-rate 0.05"
+    )
+    parser.add_argument('--scrapers', nargs='+', default=DEFAULT_SCRAPERS, choices=list(SCRAPERS),
+                        help=f"Defaults to all but the unimplemented {', '.join(sorted(STUB_SCRAPERS))}")
+    parser.add_argument('--repeat', type=int, default=5, help="Crawl passes per scraper")
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument('--rate-limited', action='store_true', help="Keep the production fetch rate limit")
+    parser.add_argument('--json', dest='json_path', help="Write results to this file")
+    parser.add_argument('--record', metavar='SCRAPER', choices=list(SCRAPERS),
+                        help="Record live pages for a scraper instead of benchmarking")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.record:
+        saved = asyncio.run(record_fixtures(args.record))
+        print(f"Recorded {saved} pages for {args.record}")
+        return
+
+    results = asyncio.run(run_benchmarks(
+        args.scrapers,
+        repeat=args.repeat,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limited=args.rate_limited
+    ))
+    print(f"{'scraper':<10} {'docs':>5} {'docs/s':>8} {'bytes':>10} {'parse ms':>9} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'fails':>6} {'429s':>5}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['documents']:>5} {r['documents_per_sec']:>8} {r['bytes']:>10} "
+              f"{r['parse_cpu_ms']:>9} {r['fetch_p50_ms']:>8} {r['fetch_p99_ms']:>8} "
+              f"{r['failed_fetches']:>6} {r['throttled']:>5}{'  (stub scraper)' if r['stub'] else ''}")
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
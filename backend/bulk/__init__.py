@@ -0,0 +1,7 @@
+from .columnar import export_tables, import_tables, load_watermarks
+
+__all__ = [
+    'export_tables',
+    'import_tables',
+    'load_watermarks'
+]
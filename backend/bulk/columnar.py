@@ -0,0 +1,375 @@
+from typing import Dict, Iterator, List, Optional, Union
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import io
+import json
+import logging
+import os
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Integer, Numeric, select, text
+from sqlalchemy.dialects.postgresql import UUID
+from backend.models import Company, Document, DocumentVersion, DocumentAnalysis
+from backend.models.aggregates import refresh_aggregates
+from backend.utils.db import engine as default_engine
+from backend.utils.tracing import span, profile_job
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed by the bulk export/import commands
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# table -> (model, watermark column used for incremental exports), in load order
+EXPORT_TABLES = {
+    'companies': (Company, 'updated_at'),
+    'documents': (Document, 'updated_at'),
+    'document_versions': (DocumentVersion, 'created_at'),
+    'document_analysis': (DocumentAnalysis, 'created_at')
+}
+
+# Full policy text; left out of exports unless asked for so snapshots stay metadata-sized
+CONTENT_COLUMNS = {'document_versions': ('content', 'raw_content')}
+
+# Pointers into tables loaded later; applied once every table is in
+DEFERRED_COLUMNS = {'documents': ('current_version_id', 'latest_analysis_id')}
+
+# Incremental exports re-read this far behind the previous watermark. Timestamps
+# are taken at transaction start (NOW()) or flush time, so a row can commit after
+# an export's snapshot while carrying an older timestamp than rows it already saw;
+# the overlap picks such rows up, and the import's upserts absorb the duplicates.
+WATERMARK_OVERLAP = timedelta(hours=1)
+
+DEFAULT_CHUNK_SIZE = 10_000
+CONTENT_CHUNK_SIZE = 500
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+MANIFEST = 'manifest.json'
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("pyarrow package is not installed")
+
+def _arrow_type(column):
+    column_type = column.type
+    if isinstance(column_type, UUID):
+        return pa.string()
+    if isinstance(column_type, BigInteger):
+        return pa.int64()
+    if isinstance(column_type, Integer):
+        return pa.int32()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, Numeric) and column_type.precision:
+        return pa.decimal128(column_type.precision, column_type.scale or 0)
+    return pa.string()
+
+def export_columns(table: str, include_content: bool = False) -> List:
+    """Columns of a table that go into an export"""
+    model, _ = EXPORT_TABLES[table]
+    skipped = () if include_content else CONTENT_COLUMNS.get(table, ())
+    return [column for column in model.__table__.columns if column.name not in skipped]
+
+def _to_batch(rows: List, columns: List, schema):
+    arrays = []
+    for i, (column, field) in enumerate(zip(columns, schema)):
+        values = [row[i] for row in rows]
+        if isinstance(column.type, UUID):
+            values = [str(value) if value is not None else None for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+class _BatchWriter:
+    """Appends record batches to a Parquet or Arrow IPC file, renamed into place on close"""
+
+    def __init__(self, path: Path, schema, fmt: str):
+        self.path = path
+        self.partial = path.with_name(path.name + '.partial')
+        self.fmt = fmt
+        if fmt == 'parquet':
+            self.writer = pq.ParquetWriter(str(self.partial), schema, compression='zstd')
+        else:
+            self.writer = pa.ipc.new_file(str(self.partial), schema)
+
+    def write(self, batch) -> None:
+        if self.fmt == 'parquet':
+            self.writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self.writer.write_batch(batch)
+
+    def close(self) -> None:
+        self.writer.close()
+        os.replace(self.partial, self.path)
+
+def export_table(connection, table: str, path: Path, fmt: str = 'parquet', since: Optional[datetime] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, include_content: bool = False,
+                 overlap: timedelta = WATERMARK_OVERLAP) -> Dict:
+    """Stream one table through a server-side cursor into a columnar file, chunk by chunk"""
+    model, watermark_column = EXPORT_TABLES[table]
+    columns = export_columns(table, include_content)
+    schema = pa.schema([pa.field(column.name, _arrow_type(column), nullable=column.nullable) for column in columns])
+    watermark_index = [column.name for column in columns].index(watermark_column)
+
+    query = select(*columns)
+    if since is not None:
+        query = query.where(model.__table__.c[watermark_column] > since - overlap)
+
+    rows_written, watermark = 0, None
+    writer = _BatchWriter(path, schema, fmt)
+    try:
+        result = connection.execution_options(stream_results=True, max_row_buffer=chunk_size).execute(query)
+        for rows in result.partitions(chunk_size):
+            writer.write(_to_batch(rows, columns, schema))
+            rows_written += len(rows)
+            chunk_watermark = max((row[watermark_index] for row in rows if row[watermark_index]), default=None)
+            if chunk_watermark and (watermark is None or chunk_watermark > watermark):
+                watermark = chunk_watermark
+    finally:
+        writer.close()
+
+    logger.info(f"Exported {rows_written} rows from {table} to {path}")
+    # An empty increment keeps the previous watermark so exports can be chained
+    watermark = watermark or since
+    return {
+        'file': path.name,
+        'rows': rows_written,
+        'watermark_column': watermark_column,
+        'watermark': watermark.isoformat() if watermark else None
+    }
+
+def export_tables(
+    output_dir: Union[str, Path],
+    tables: Optional[List[str]] = None,
+    since: Optional[Union[datetime, Dict[str, datetime]]] = None,
+    fmt: str = 'parquet',
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    include_content: bool = False,
+    overlap: timedelta = WATERMARK_OVERLAP,
+    engine=None
+) -> Dict:
+    """Export tables from one consistent snapshot and write a manifest with per-table watermarks
+
+    since is a single timestamp or a per-table mapping (see load_watermarks);
+    only rows whose watermark column is newer than since minus overlap are exported.
+    """
+    _require_pyarrow()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tables = tables or list(EXPORT_TABLES)
+    manifest = {
+        'format': fmt,
+        'created_at': datetime.utcnow().isoformat(),
+        'include_content': include_content,
+        'incremental': since is not None,
+        'overlap_seconds': int(overlap.total_seconds()),
+        'tables': {}
+    }
+
+    with profile_job("bulk-export"), span('bulk.export', log_summary=True):
+        # One read-only repeatable-read transaction, so every file sees the same snapshot
+        with (engine or default_engine).connect().execution_options(
+            isolation_level='REPEATABLE READ', postgresql_readonly=True
+        ) as connection:
+            with connection.begin():
+                for table in tables:
+                    table_since = since.get(table) if isinstance(since, dict) else since
+                    table_chunk_size = chunk_size
+                    if include_content and table in CONTENT_COLUMNS:
+                        table_chunk_size = min(chunk_size, CONTENT_CHUNK_SIZE)
+                    with span('bulk.export_table', table=table):
+                        manifest['tables'][table] = export_table(
+                            connection, table, output_dir / f"{table}{FORMATS[fmt]}", fmt,
+                            since=table_since, chunk_size=table_chunk_size, include_content=include_content,
+                            overlap=overlap
+                        )
+
+    with open(output_dir / MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def load_watermarks(manifest_path: Union[str, Path]) -> Dict[str, datetime]:
+    """Per-table watermarks from a previous export's manifest, to chain incremental exports"""
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    return {
+        table: datetime.fromisoformat(entry['watermark'])
+        for table, entry in manifest['tables'].items()
+        if entry.get('watermark')
+    }
+
+def _iter_batches(path: Path, fmt: str, chunk_size: int) -> Iterator:
+    if fmt == 'parquet':
+        yield from pq.ParquetFile(str(path)).iter_batches(batch_size=chunk_size)
+    else:
+        reader = pa.ipc.open_file(str(path))
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+
+def _copy_batch(cursor, stage: str, batch) -> None:
+    """COPY one record batch into a staging table via an in-memory CSV buffer"""
+    buffer = io.BytesIO()
+    pa_csv.write_csv(batch, buffer)
+    buffer.seek(0)
+    names = ', '.join(batch.schema.names)
+    cursor.copy_expert(f"COPY {stage} ({names}) FROM STDIN WITH (FORMAT csv, HEADER true)", buffer)
+
+def _reference_exists(table: str, column_name: str, stage: str) -> str:
+    """SQL condition that a staged row's foreign key is NULL or points at an existing row"""
+    column = EXPORT_TABLES[table][0].__table__.c[column_name]
+    parent = next(iter(column.foreign_keys)).column.table.name
+    condition = f"s.{column_name} IS NULL OR EXISTS (SELECT 1 FROM {parent} p WHERE p.id = s.{column_name})"
+    if parent == table:
+        # Self references may point at rows inserted by the same statement
+        condition += f" OR EXISTS (SELECT 1 FROM {stage} ps WHERE ps.id = s.{column_name})"
+    return f"({condition})"
+
+def _merge_stage(connection, table: str, stage: str, names: List[str]) -> int:
+    """Upsert staged rows into the table, skipping rows whose references are missing
+
+    Metadata-only files lack NOT NULL content columns, so they can only update
+    rows that already exist.
+    """
+    model, _ = EXPORT_TABLES[table]
+    deferred = DEFERRED_COLUMNS.get(table, ())
+    updated = [name for name in names if name != 'id' and name not in deferred]
+    missing_required = [
+        column.name for column in model.__table__.columns
+        if not column.nullable and column.name not in names
+    ]
+    guards = [
+        _reference_exists(table, column.name, stage) for column in model.__table__.columns
+        if column.foreign_keys and column.name in names and column.name not in deferred
+    ]
+    where = f"WHERE {' AND '.join(guards)}" if guards else ''
+
+    if missing_required:
+        logger.info(f"{table} export lacks {', '.join(missing_required)}; updating existing rows only")
+        assignments = ', '.join(f"{name} = s.{name}" for name in updated)
+        result = connection.execute(text(
+            f"UPDATE {table} t SET {assignments} FROM {stage} s WHERE t.id = s.id"
+            + (f" AND {' AND '.join(guards)}" if guards else '')
+        ))
+    else:
+        inserted = [name for name in names if name not in deferred]
+        assignments = ', '.join(f"{name} = EXCLUDED.{name}" for name in updated)
+        result = connection.execute(text(
+            f"INSERT INTO {table} ({', '.join(inserted)}) "
+            f"SELECT {', '.join(f's.{name}' for name in inserted)} FROM {stage} s {where} "
+            f"ON CONFLICT (id) DO UPDATE SET {assignments}"
+        ))
+
+    staged = connection.execute(text(f"SELECT COUNT(*) FROM {stage}")).scalar()
+    if staged > result.rowcount:
+        logger.warning(
+            f"Skipped {staged - result.rowcount} of {staged} {table} rows "
+            f"that are new without their required columns or reference missing rows"
+        )
+    return result.rowcount
+
+def import_tables(input_dir: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE, engine=None) -> Dict[str, int]:
+    """Bulk load an export directory with COPY into staging tables, merged in one transaction
+
+    Companies, documents, versions and analyses are loaded in dependency order;
+    document pointers are applied last. Aggregates are refreshed at the end, but
+    the search and clause indexes must be rebuilt with their own commands.
+    """
+    _require_pyarrow()
+    input_dir = Path(input_dir)
+    with open(input_dir / MANIFEST) as f:
+        manifest = json.load(f)
+    fmt = manifest['format']
+    if not manifest.get('include_content') and 'document_versions' in manifest['tables']:
+        logger.warning(
+            "Export has no version content: only versions already in the database are updated, "
+            "and analyses and document pointers referring to other versions are skipped"
+        )
+
+    counts = {}
+    with profile_job("bulk-import"), span('bulk.import', log_summary=True):
+        with (engine or default_engine).begin() as connection:
+            cursor = connection.connection.cursor()
+            for table in EXPORT_TABLES:
+                entry = manifest['tables'].get(table)
+                if not entry:
+                    continue
+                path = input_dir / entry['file']
+                stage = f"bulk_import_{table}"
+                names = None
+
+                with span('bulk.import_table', table=table):
+                    for batch in _iter_batches(path, fmt, chunk_size):
+                        if names is None:
+                            names = batch.schema.names
+                            connection.execute(text(
+                                f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+                                f"SELECT {', '.join(names)} FROM {table} WITH NO DATA"
+                            ))
+                        _copy_batch(cursor, stage, batch)
+                    counts[table] = _merge_stage(connection, table, stage, names) if names else 0
+                logger.info(f"Imported {counts[table]} rows into {table}")
+
+            for table, deferred in DEFERRED_COLUMNS.items():
+                if not counts.get(table):
+                    continue
+                stage = f"bulk_import_{table}"
+                for name in deferred:
+                    # Pointers to versions or analyses that did not make it in are left as they were
+                    connection.execute(text(
+                        f"UPDATE {table} t SET {name} = s.{name} FROM {stage} s "
+                        f"WHERE t.id = s.id AND {_reference_exists(table, name, stage)}"
+                    ))
+
+            if counts.get('documents') or counts.get('document_analysis'):
+                refresh_aggregates(connection)
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stream companies, documents, versions and analyses to or from Parquet/Arrow files",
+        epilog="e.g. python -m backend.bulk.columnar export data/export --since-manifest data/prev/manifest.json"
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = commands.add_parser('export', help="Write a snapshot or incremental export")
+    export_parser.add_argument('output_dir')
+    export_parser.add_argument('--tables', nargs='+', default=list(EXPORT_TABLES), choices=list(EXPORT_TABLES))
+    export_parser.add_argument('--format', dest='fmt', default='parquet', choices=list(FORMATS))
+    export_parser.add_argument('--since', type=datetime.fromisoformat, help="Only rows changed after this time")
+    export_parser.add_argument('--since-manifest', metavar='PATH',
+                               help="Only rows changed after the watermarks of a previous export")
+    export_parser.add_argument('--include-content', action='store_true', help="Include full version text")
+    export_parser.add_argument('--overlap-minutes', type=float, default=WATERMARK_OVERLAP.total_seconds() / 60,
+                               help="Re-read this far behind the watermark to catch late commits")
+    export_parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    import_parser = commands.add_parser('import', help="Bulk load an export directory with COPY")
+    import_parser.add_argument('input_dir')
+    import_parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == 'export':
+        since = load_watermarks(args.since_manifest) if args.since_manifest else args.since
+        manifest = export_tables(
+            args.output_dir,
+            tables=args.tables,
+            since=since,
+            fmt=args.fmt,
+            chunk_size=args.chunk_size,
+            include_content=args.include_content,
+            overlap=timedelta(minutes=args.overlap_minutes)
+        )
+        for table, entry in manifest['tables'].items():
+            print(f"{table:<18} {entry['rows']:>10} rows  watermark {entry['watermark']}")
+    else:
+        counts = import_tables(args.input_dir, chunk_size=args.chunk_size)
+        for table, count in counts.items():
+            print(f"{table:<18} {count:>10} rows")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 from sqlalchemy import (
-    Column, String, Integer, Boolean, DateTime, ForeignKey, Text, Numeric, JSON, Date, BigInteger
+    Column, String, Integer, Boolean, DateTime, ForeignKey, Text, Numeric, JSON, Date, BigInteger, Index,
+    UniqueConstraint
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy.orm import declarative_base, relationship
 import uuid
 import datetime
+from backend.utils.clock import utcnow
 
 Base = declarative_base()
 
@@ -27,6 +29,10 @@ class Company(Base):
     status = Column(String(50), default='active')
     scraping_priority = Column(Integer, default=5)
     scraping_frequency = Column(String(20), default='weekly')
+    # Bounds for the adaptive per-URL revisit interval
+    min_crawl_interval_hours = Column(Integer, default=6)
+    max_crawl_interval_hours = Column(Integer, default=720)
+    last_crawl_started_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     deleted_at = Column(DateTime)
@@ -71,13 +77,28 @@ class Document(Base):
     file_path = Column(Text)
     file_size = Column(BigInteger)
     file_hash = Column(String(64))
+    # Maintained on ingestion/analysis so current state is a single indexed lookup
+    current_version_id = Column(
+        UUID(as_uuid=True), ForeignKey('document_versions.id', use_alter=True, name='fk_documents_current_version')
+    )
+    latest_analysis_id = Column(
+        UUID(as_uuid=True), ForeignKey('document_analysis.id', use_alter=True, name='fk_documents_latest_analysis')
+    )
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     deleted_at = Column(DateTime)
 
     company = relationship("Company", back_populates="documents")
     product = relationship("Product", back_populates="documents")
-    versions = relationship("DocumentVersion", back_populates="document")
+    versions = relationship("DocumentVersion", back_populates="document", foreign_keys="DocumentVersion.document_id")
+    current_version = relationship("DocumentVersion", foreign_keys=[current_version_id], post_update=True)
+    latest_analysis = relationship("DocumentAnalysis", foreign_keys=[latest_analysis_id], post_update=True)
+
+    __table_args__ = (
+        Index('idx_documents_company', 'company_id'),
+        Index('idx_documents_company_type', 'company_id', 'document_type', 'status'),
+        Index('idx_documents_company_url', 'company_id', 'source_url'),
+    )
 
 class DocumentVersion(Base):
     __tablename__ = 'document_versions'
@@ -93,9 +114,15 @@ class DocumentVersion(Base):
     extracted_at = Column(DateTime, default=datetime.datetime.utcnow)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
-    document = relationship("Document", back_populates="versions")
+    document = relationship("Document", back_populates="versions", foreign_keys=[document_id])
     analysis = relationship("DocumentAnalysis", back_populates="version")
 
+    __table_args__ = (
+        # The schema's UNIQUE(document_id, version_number); also serves document_id lookups
+        UniqueConstraint('document_id', 'version_number', name='document_versions_document_id_version_number_key'),
+        Index('idx_document_versions_hash', 'content_hash'),
+    )
+
 class DocumentAnalysis(Base):
     __tablename__ = 'document_analysis'
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -111,4 +138,110 @@ class DocumentAnalysis(Base):
 
     version = relationship("DocumentVersion", back_populates="analysis")
 
-# ... Add other models as needed (Clause, ClauseType, User, etc.) ...
\ No newline at end of file
+    __table_args__ = (
+        Index('idx_analysis_version', 'document_version_id'),
+    )
+
+class DocumentSearchEntry(Base):
+    __tablename__ = 'document_search_index'
+    document_id = Column(UUID(as_uuid=True), ForeignKey('documents.id'), primary_key=True)
+    document_version_id = Column(UUID(as_uuid=True), ForeignKey('document_versions.id'), nullable=False)
+    company_id = Column(UUID(as_uuid=True), ForeignKey('companies.id'), nullable=False)
+    document_type = Column(String(50), nullable=False)
+    title = Column(String(500))
+    search_vector = Column(TSVECTOR, nullable=False)
+    indexed_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('idx_search_company_type', 'company_id', 'document_type'),
+    )
+
+class VersionChange(Base):
+    __tablename__ = 'version_changes'
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    document_id = Column(UUID(as_uuid=True), ForeignKey('documents.id'), nullable=False)
+    old_version_id = Column(UUID(as_uuid=True), ForeignKey('document_versions.id'), nullable=False)
+    new_version_id = Column(UUID(as_uuid=True), ForeignKey('document_versions.id'), nullable=False, unique=True)
+    status = Column(String(20), nullable=False, default='pending')  # pending, done, failed
+    similarity = Column(Numeric(5,4))
+    chars_added = Column(Integer)
+    chars_removed = Column(Integer)
+    # Non-equal difflib opcodes as [tag, i1, i2, j1, j2] character ranges into the two versions
+    opcodes = Column(JSON)
+    error = Column(Text)
+    # Aware UTC to match the timestamptz columns of migration 005
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+    processed_at = Column(DateTime(timezone=True))
+
+    old_version = relationship("DocumentVersion", foreign_keys=[old_version_id])
+    new_version = relationship("DocumentVersion", foreign_keys=[new_version_id])
+
+    __table_args__ = (
+        Index('idx_version_changes_document', 'document_id', 'created_at'),
+        Index('idx_version_changes_pending', 'created_at', postgresql_where=(status == 'pending')),
+    )
+
+class CrawlUrl(Base):
+    __tablename__ = 'crawl_frontier'
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    company_id = Column(UUID(as_uuid=True), ForeignKey('companies.id'), nullable=False)
+    url = Column(Text, nullable=False)
+    source = Column(String(20), nullable=False)  # sitemap, landing
+    status = Column(String(20), nullable=False, default='pending')  # pending, fetched, unchanged, failed, disallowed
+    document_id = Column(UUID(as_uuid=True), ForeignKey('documents.id'))
+    # Crawl timestamps are timezone-aware UTC to match their timestamptz columns
+    sitemap_lastmod = Column(DateTime(timezone=True))
+    etag = Column(Text)
+    last_modified = Column(Text)
+    content_hash = Column(String(64))
+    last_status_code = Column(Integer)
+    failure_count = Column(Integer, nullable=False, default=0)
+    revisit_interval_seconds = Column(Integer)
+    next_due_at = Column(DateTime(timezone=True))
+    discovered_at = Column(DateTime(timezone=True), default=utcnow)
+    last_fetched_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        UniqueConstraint('company_id', 'url'),
+        Index('idx_crawl_frontier_due', 'next_due_at', 'company_id'),
+    )
+
+class RobotsCache(Base):
+    __tablename__ = 'robots_cache'
+    origin = Column(String(255), primary_key=True)
+    status_code = Column(Integer)
+    content = Column(Text)
+    fetched_at = Column(DateTime(timezone=True), default=utcnow)
+
+class SitemapCache(Base):
+    """Validators and outcome of a company's last fetch of one sitemap, for conditional refetches"""
+    __tablename__ = 'sitemap_cache'
+    company_id = Column(UUID(as_uuid=True), ForeignKey('companies.id'), primary_key=True)
+    url = Column(Text, primary_key=True)
+    etag = Column(Text)
+    last_modified = Column(Text)
+    children = Column(JSON)  # child sitemap URLs when the sitemap is an index
+    document_count = Column(Integer, nullable=False, default=0)
+    fetched_at = Column(DateTime(timezone=True), default=utcnow)
+
+class CompanyScoreAggregate(Base):
+    __tablename__ = 'company_score_aggregates'
+    company_id = Column(UUID(as_uuid=True), ForeignKey('companies.id'), primary_key=True)
+    document_type = Column(String(50), primary_key=True)
+    document_count = Column(Integer, nullable=False)
+    overall_score = Column(Numeric(4,2))
+    complexity_score = Column(Numeric(4,2))
+    readability_score = Column(Numeric(4,2))
+    sentiment_score = Column(Numeric(4,2))
+    confidence_level = Column(Numeric(3,2))
+    version_count = Column(Integer, nullable=False)
+    changes_last_90_days = Column(Integer, nullable=False)
+    last_changed_at = Column(DateTime)
+    last_analyzed_at = Column(DateTime)
+    refreshed_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+# ... Add other models as needed (Clause, ClauseType, User, etc.) ...
+
+# Registers the session hooks that keep CompanyScoreAggregate current
+from . import aggregates  # noqa: E402,F401
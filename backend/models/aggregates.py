@@ -0,0 +1,163 @@
+from typing import List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+import argparse
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Recomputes company/document-type aggregates from each document's latest
+# analysis pointer. The optional scope limits the work to the groups touched
+# by a flush, so incremental refreshes only read a handful of documents.
+# changes_last_90_days is exact as of refreshed_at; the periodic full refresh
+# (run()) ages the window for groups that see no new versions or analyses.
+REFRESH_SQL = """
+    INSERT INTO company_score_aggregates (
+        company_id, document_type, document_count, overall_score, complexity_score,
+        readability_score, sentiment_score, confidence_level, version_count,
+        changes_last_90_days, last_changed_at, last_analyzed_at, refreshed_at
+    )
+    SELECT d.company_id, d.document_type, COUNT(*),
+           AVG(la.overall_score), AVG(la.complexity_score), AVG(la.readability_score),
+           AVG(la.sentiment_score), AVG(la.confidence_level),
+           SUM(vs.version_count), SUM(vs.recent_changes),
+           MAX(vs.last_changed_at), MAX(la.analyzed_at), NOW()
+    FROM documents d
+    JOIN document_analysis la ON la.id = d.latest_analysis_id
+    JOIN LATERAL (
+        SELECT COUNT(*) AS version_count,
+               COUNT(*) FILTER (
+                   WHERE dv.version_number > 1 AND dv.extracted_at >= NOW() - INTERVAL '90 days'
+               ) AS recent_changes,
+               MAX(dv.extracted_at) AS last_changed_at
+        FROM document_versions dv
+        WHERE dv.document_id = d.id
+    ) vs ON TRUE
+    WHERE d.deleted_at IS NULL {scope}
+    GROUP BY d.company_id, d.document_type
+    ON CONFLICT (company_id, document_type) DO UPDATE SET
+        document_count = EXCLUDED.document_count,
+        overall_score = EXCLUDED.overall_score,
+        complexity_score = EXCLUDED.complexity_score,
+        readability_score = EXCLUDED.readability_score,
+        sentiment_score = EXCLUDED.sentiment_score,
+        confidence_level = EXCLUDED.confidence_level,
+        version_count = EXCLUDED.version_count,
+        changes_last_90_days = EXCLUDED.changes_last_90_days,
+        last_changed_at = EXCLUDED.last_changed_at,
+        last_analyzed_at = EXCLUDED.last_analyzed_at,
+        refreshed_at = EXCLUDED.refreshed_at
+"""
+
+VERSION_SCOPE = """
+    AND (d.company_id, d.document_type) IN (
+        SELECT sd.company_id, sd.document_type
+        FROM documents sd
+        JOIN document_versions sv ON sv.document_id = sd.id
+        WHERE sv.id = ANY(CAST(:version_ids AS uuid[]))
+    )
+"""
+
+# A document points at the newest analysis of its current version; until that
+# version is analysed the pointer stays on the previous one, so the document
+# keeps counting towards its group. Incremental updates and the full refresh
+# share this statement, differing only in which analyses they consider.
+LATEST_ANALYSIS_SQL = """
+    UPDATE documents d SET latest_analysis_id = latest.id, updated_at = NOW()
+    FROM (
+        SELECT DISTINCT ON (document_version_id) id, document_version_id
+        FROM document_analysis
+        {scope}
+        ORDER BY document_version_id, analyzed_at DESC
+    ) latest
+    WHERE d.current_version_id = latest.document_version_id
+      AND d.latest_analysis_id IS DISTINCT FROM latest.id
+"""
+
+ANALYSIS_SCOPE = "WHERE id = ANY(CAST(:analysis_ids AS uuid[]))"
+
+# Groups left without any analysed, live document
+DELETE_EMPTY_GROUPS_SQL = text("""
+    DELETE FROM company_score_aggregates a
+    WHERE NOT EXISTS (
+        SELECT 1 FROM documents d
+        JOIN document_analysis la ON la.id = d.latest_analysis_id
+        WHERE d.deleted_at IS NULL
+          AND d.company_id = a.company_id
+          AND d.document_type = a.document_type
+    )
+""")
+
+def update_latest_analysis(connection, analysis_ids: Optional[List[str]] = None) -> None:
+    """Point documents at new analyses of their current version, or at any analysis when None"""
+    if analysis_ids is None:
+        connection.execute(text(LATEST_ANALYSIS_SQL.format(scope='')))
+    elif analysis_ids:
+        connection.execute(
+            text(LATEST_ANALYSIS_SQL.format(scope=ANALYSIS_SCOPE)),
+            {'analysis_ids': [str(a) for a in analysis_ids]}
+        )
+
+def refresh_aggregates(connection, version_ids: Optional[List[str]] = None) -> None:
+    """Refresh aggregates for the groups owning the given versions, or all groups"""
+    if version_ids is None:
+        connection.execute(text(REFRESH_SQL.format(scope='')))
+    elif version_ids:
+        connection.execute(
+            text(REFRESH_SQL.format(scope=VERSION_SCOPE)),
+            {'version_ids': [str(v) for v in version_ids]}
+        )
+
+@event.listens_for(Session, 'after_flush')
+def _on_new_analysis(session, flush_context):
+    """Fold newly flushed versions and analyses into the pointers and aggregates in the same transaction"""
+    from . import DocumentAnalysis, DocumentVersion
+
+    analyses = [obj for obj in session.new if isinstance(obj, DocumentAnalysis)]
+    version_ids = {obj.id for obj in session.new if isinstance(obj, DocumentVersion)}
+    if not analyses and not version_ids:
+        return
+    connection = session.connection()
+    if analyses:
+        update_latest_analysis(connection, [a.id for a in analyses])
+        version_ids.update(a.document_version_id for a in analyses)
+    refresh_aggregates(connection, list(version_ids))
+
+def refresh_all() -> None:
+    """Repoint every document at its latest analysis and rebuild all aggregate groups"""
+    from backend.utils.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        connection = db.connection()
+        update_latest_analysis(connection)
+        refresh_aggregates(connection)
+        connection.execute(DELETE_EMPTY_GROUPS_SQL)
+        db.commit()
+        logger.info("Refreshed all company score aggregates")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+async def run(interval_hours: float = 24.0) -> None:
+    """Run the full refresh on a schedule so time windows age out for idle groups"""
+    while True:
+        try:
+            await asyncio.to_thread(refresh_all)
+        except Exception as e:
+            logger.error(f"Aggregate refresh failed: {str(e)}")
+        await asyncio.sleep(interval_hours * 3600)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild company score aggregates")
+    parser.add_argument('--every-hours', type=float, help="Keep running, refreshing at this interval")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.every_hours:
+        asyncio.run(run(args.every_hours))
+    else:
+        refresh_all()
@@ -2,27 +2,51 @@ from abc import ABC, abstractmethod
 import logging
 import aiohttp
 import asyncio
+import hashlib
 from datetime import datetime
 from typing import Optional, Dict, List
+from urllib.parse import urljoin, urldefrag
 from ratelimit import limits, sleep_and_retry
 from bs4 import BeautifulSoup
-from backend.models import Document, Company
+from backend.models import Document, DocumentVersion, VersionChange, Company, SitemapCache
+from backend.utils.clock import utcnow
 from backend.utils.db import SessionLocal
+from backend.utils.tracing import span, traced, profile_job
+from backend.search import SearchIndexer
+from backend.analysis.clause_index import get_clause_index, save_clause_index
+from .frontier import CrawlFrontier
+from .robots import RobotsPolicy
+from .sitemap import parse_sitemap
+
+USER_AGENT = 'EULAComparison/1.0 (+https://eulacomparison.com/bot)'
 
 logger = logging.getLogger(__name__)
 
 class BaseScraper(ABC):
     """Base scraper class that all site-specific scrapers must inherit from"""
     
+    BASE_URL = ''
+    # Substrings identifying policy documents among sitemap and landing page links
+    DOCUMENT_URL_PATTERNS: List[str] = []
+    # Explicit sitemaps; robots.txt Sitemap entries and /sitemap.xml are always tried
+    SITEMAP_URLS: List[str] = []
+    ROBOTS_USER_AGENT = 'EULAComparison'
+    MAX_SITEMAPS = 20
+    
     def __init__(self, company_id: str, rate_limit: int = 3):
         self.company_id = company_id
         self.rate_limit = rate_limit
         self.session = aiohttp.ClientSession(
             headers={
-                'User-Agent': 'EULAComparison/1.0 (+https://eulacomparison.com/bot)'
+                'User-Agent': USER_AGENT
             }
         )
         self.db = SessionLocal()
+        self.search_indexer = SearchIndexer(self.db)
+        # Bodies already fetched by the crawl loop, served to extract_document_content
+        self._prefetched: Dict[str, str] = {}
+        # Versions waiting for their transaction to commit before entering the clause index
+        self._pending_clause_versions: List[DocumentVersion] = []
     
     @abstractmethod
     async def get_document_urls(self) -> List[str]:
@@ -34,19 +58,47 @@ class BaseScraper(ABC):
         """Extract content from a document URL"""
         pass
     
+    def in_scope(self, url: str) -> bool:
+        """Whether an absolute URL lies under BASE_URL"""
+        base = self.BASE_URL.rstrip('/')
+        return url == base or url.startswith(f"{base}/")
+    
+    def is_document_url(self, url: str) -> bool:
+        """Whether an absolute discovered URL is a policy document this scraper handles"""
+        return self.in_scope(url) and any(pattern in url.lower() for pattern in self.DOCUMENT_URL_PATTERNS)
+    
+    def absolute_url(self, href: str, base: Optional[str] = None) -> str:
+        """Resolve a link against the page it came from, dropping fragments"""
+        return urldefrag(urljoin(base or f"{self.BASE_URL}/", href))[0]
+    
+    @traced('scraper.fetch_page')
     @sleep_and_retry
     @limits(calls=1, period=1)  # Basic rate limiting
-    async def fetch_page(self, url: str) -> Optional[str]:
-        """Fetch page content with rate limiting and error handling"""
+    async def _request(self, url: str, headers: Optional[Dict] = None, binary: bool = False) -> Dict:
+        """Rate-limited GET returning status, body and cache validators"""
         try:
-            async with self.session.get(url) as response:
+            async with self.session.get(url, headers=headers or {}) as response:
+                content = None
                 if response.status == 200:
-                    return await response.text()
-                logger.error(f"Failed to fetch {url}: {response.status}")
-                return None
+                    content = await response.read() if binary else await response.text()
+                return {
+                    'status': response.status,
+                    'content': content,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                }
         except Exception as e:
             logger.error(f"Error fetching {url}: {str(e)}")
-            return None
+            return {'status': None, 'content': None, 'etag': None, 'last_modified': None}
+    
+    async def fetch_page(self, url: str) -> Optional[str]:
+        """Fetch page content with rate limiting and error handling"""
+        if url in self._prefetched:
+            return self._prefetched[url]
+        response = await self._request(url)
+        if response['status'] != 200:
+            logger.error(f"Failed to fetch {url}: {response['status']}")
+        return response['content']
             
     async def process_document(self, url: str) -> Optional[Document]:
         """Process a single document URL"""
@@ -54,33 +106,213 @@ class BaseScraper(ABC):
         if not content:
             return None
             
-        doc_data = await self.extract_document_content(url)
+        with span('scraper.extract_document_content'):
+            doc_data = await self.extract_document_content(url)
+        if not doc_data:
+            return None
         
-        # Create document record
-        document = Document(
-            company_id=self.company_id,
-            source_url=url,
-            **doc_data
-        )
+        text = doc_data.pop('content', '')
+        document = self._get_or_create_document(url, doc_data)
+        self._store_version(document, text, raw_content=content)
         return document
     
-    async def run(self):
-        """Main scraping process"""
+    def _get_or_create_document(self, url: str, doc_data: Dict) -> Document:
+        """Find the tracked document for a URL, creating it on first sight"""
+        document = self.db.query(Document).filter(
+            Document.company_id == self.company_id,
+            Document.source_url == url
+        ).first()
+        if document:
+            for key, value in doc_data.items():
+                setattr(document, key, value)
+        else:
+            document = Document(
+                company_id=self.company_id,
+                source_url=url,
+                **doc_data
+            )
+            self.db.add(document)
+        self.db.flush()
+        return document
+    
+    def _store_version(self, document: Document, text: str, raw_content: Optional[str] = None) -> Optional[DocumentVersion]:
+        """Store a new version if the content changed and feed it to the indexes and change feed"""
+        content_hash = hashlib.sha256(text.encode()).hexdigest()
+        latest = document.current_version
+        if latest and latest.content_hash == content_hash:
+            return None
+        
+        version = DocumentVersion(
+            document=document,
+            version_number=latest.version_number + 1 if latest else 1,
+            content=text,
+            raw_content=raw_content,
+            content_hash=content_hash,
+            word_count=len(text.split()),
+            character_count=len(text)
+        )
+        self.db.add(version)
+        self.db.flush()
+        document.file_hash = content_hash
+        document.current_version = version
+        if latest:
+            # Queue the diff for the background DiffWorker
+            self.db.add(VersionChange(
+                document_id=document.id,
+                old_version_id=latest.id,
+                new_version_id=version.id
+            ))
+        
+        self.search_indexer.index_version(version)
+        self._pending_clause_versions.append(version)
+        return version
+    
+    def _index_committed_clauses(self) -> None:
+        """Feed committed versions to the clause index, which must never see rolled-back rows
+
+        The index is saved straight away: versions are committed one document
+        at a time, and a crash before the end of the run must not leave
+        committed versions missing from the on-disk index.
+        """
+        if not self._pending_clause_versions:
+            return
+        clause_index = get_clause_index()
+        for version in self._pending_clause_versions:
+            try:
+                clause_index.add_version(version)
+            except Exception as e:
+                logger.error(f"Failed to index clauses for version {version.id}: {str(e)}")
+        self._pending_clause_versions.clear()
         try:
-            urls = await self.get_document_urls()
-            documents = []
-            
-            for url in urls:
-                doc = await self.process_document(url)
-                if doc:
-                    documents.append(doc)
-            
-            # Bulk save documents
-            self.db.bulk_save_objects(documents)
+            save_clause_index()
+        except Exception as e:
+            logger.error(f"Failed to save clause index: {str(e)}")
+    
+    async def _fetch_sitemap(self, frontier: CrawlFrontier, url: str) -> Optional[SitemapCache]:
+        """Conditionally fetch one sitemap, adding its policy URLs to the frontier
+
+        Returns the cached row (child sitemaps and policy URL count), or None
+        when the sitemap could not be fetched. A 304 reuses the cached row
+        without re-parsing, since its URLs are already in the frontier.
+        """
+        cached = self.db.query(SitemapCache).get((self.company_id, url))
+        headers = {}
+        if cached and cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached and cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+        response = await self._request(url, headers=headers, binary=True)
+        if response['status'] == 304 and cached is not None:
+            cached.fetched_at = utcnow()
+            return cached
+        if response['content'] is None:
+            return None
+        
+        pages, children = parse_sitemap(response['content'])
+        documents = [(loc, lastmod) for loc, lastmod in pages if self.is_document_url(loc)]
+        if cached is None:
+            cached = SitemapCache(company_id=self.company_id, url=url)
+            self.db.add(cached)
+        cached.etag = response['etag']
+        cached.last_modified = response['last_modified']
+        cached.children = children
+        cached.document_count = len(documents)
+        cached.fetched_at = utcnow()
+        for loc, lastmod in documents:
+            frontier.add(loc, 'sitemap', lastmod)
+        return cached
+    
+    async def discover_urls(self, frontier: CrawlFrontier, robots: RobotsPolicy) -> None:
+        """Seed the frontier from sitemaps, falling back to the landing page links"""
+        pending = list(dict.fromkeys(
+            self.SITEMAP_URLS + robots.sitemaps + [self.absolute_url('/sitemap.xml')]
+        ))
+        seen, found = set(), 0
+        while pending and len(seen) < self.MAX_SITEMAPS:
+            sitemap_url = pending.pop(0)
+            if sitemap_url in seen or not robots.allowed(sitemap_url):
+                continue
+            seen.add(sitemap_url)
+            cached = await self._fetch_sitemap(frontier, sitemap_url)
+            if cached is None:
+                continue
+            pending.extend(cached.children or [])
+            found += cached.document_count
+        
+        # Landing pages are only re-parsed when sitemaps give us nothing
+        if not found:
+            for url in await self.get_document_urls() or []:
+                frontier.add(url, 'landing')
+        self.db.commit()
+    
+    async def crawl_entry(self, frontier: CrawlFrontier, entry, robots: RobotsPolicy) -> None:
+        """Fetch one frontier URL conditionally and checkpoint the result"""
+        if not robots.allowed(entry.url):
+            frontier.mark_disallowed(entry)
             self.db.commit()
+            return
+        
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        response = await self._request(entry.url, headers=headers)
+        
+        if response['status'] == 304:
+            frontier.mark_unchanged(entry, response)
+        elif response['content'] is None:
+            logger.error(f"Failed to fetch {entry.url}: {response['status']}")
+            frontier.mark_failed(entry, response['status'])
+        else:
+            self._prefetched[entry.url] = response['content']
+            try:
+                document = await self.process_document(entry.url)
+                frontier.mark_fetched(
+                    entry,
+                    response,
+                    document_id=document.id if document else None,
+                    content_hash=document.file_hash if document else None
+                )
+            except Exception as e:
+                logger.error(f"Failed to process {entry.url}: {str(e)}")
+                self.db.rollback()
+                self.search_indexer.discard()
+                self._pending_clause_versions.clear()
+                frontier.mark_failed(entry, response['status'])
+            finally:
+                self._prefetched.pop(entry.url, None)
+        
+        with span('db.commit'):
+            self.db.commit()
+        self.search_indexer.flush()
+        self._index_committed_clauses()
+    
+    async def run(self):
+        """Main scraping process; progress is checkpointed per document so a crashed crawl resumes"""
+        try:
+            with profile_job(f"scrape-{self.company_id}"), \
+                    span('scraper.run', log_summary=True, company_id=self.company_id):
+                frontier = CrawlFrontier(self.db, self.company_id)
+                robots = await RobotsPolicy.load(self, self.absolute_url('/'))
+                if robots.unavailable:
+                    # Leave the frontier untouched; the short robots cache TTL retries soon
+                    logger.warning(f"robots.txt unreachable for company {self.company_id}, skipping crawl")
+                    return
+                # Discovery only runs when there is crawling to do, so a company
+                # whose URLs are all scheduled later costs no sitemap or landing fetches
+                if frontier.is_empty() or frontier.due_entries(limit=1):
+                    await self.discover_urls(frontier, robots)
+                
+                for entry in frontier.due_entries():
+                    await self.crawl_entry(frontier, entry, robots)
+                    if robots.crawl_delay:
+                        await asyncio.sleep(robots.crawl_delay)
             
         except Exception as e:
             logger.error(f"Scraping failed for company {self.company_id}: {str(e)}")
             self.db.rollback()
+            self.search_indexer.discard()
+            self._pending_clause_versions.clear()
         finally:
             await self.session.close()
\ No newline at end of file
@@ -0,0 +1,88 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+import logging
+from backend.models import CrawlUrl, Company
+from backend.utils.clock import utcnow
+from .scheduler import CrawlScheduler, due_filter
+
+logger = logging.getLogger(__name__)
+
+class CrawlFrontier:
+    """Persistent per-company crawl frontier
+
+    Each discovered URL keeps its validators, status and next due time, so
+    a crawl only revisits URLs that may have changed and a crashed crawl
+    resumes where it stopped: URLs checkpointed before the crash are not due.
+    Due times come from the adaptive CrawlScheduler.
+    """
+
+    def __init__(self, db, company_id: str):
+        self.db = db
+        self.company_id = company_id
+        self.scheduler = CrawlScheduler(db, db.query(Company).get(company_id))
+
+    def add(self, url: str, source: str, lastmod: Optional[datetime] = None) -> CrawlUrl:
+        """Record a discovered URL; a newer sitemap lastmod makes it due immediately"""
+        entry = self.db.query(CrawlUrl).filter(
+            CrawlUrl.company_id == self.company_id,
+            CrawlUrl.url == url
+        ).first()
+        if entry is None:
+            entry = CrawlUrl(company_id=self.company_id, url=url, source=source)
+            self.db.add(entry)
+        if lastmod is not None:
+            if entry.last_fetched_at and lastmod > entry.last_fetched_at:
+                entry.next_due_at = utcnow()
+            entry.sitemap_lastmod = lastmod
+        return entry
+
+    def is_empty(self) -> bool:
+        """Whether discovery has never recorded a URL for the company"""
+        return self.db.query(CrawlUrl.id).filter(CrawlUrl.company_id == self.company_id).first() is None
+
+    def due_entries(self, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[CrawlUrl]:
+        """The company's due queue: never-scheduled URLs first, then most overdue"""
+        query = self.db.query(CrawlUrl).filter(
+            CrawlUrl.company_id == self.company_id,
+            due_filter(now or utcnow())
+        ).order_by(CrawlUrl.next_due_at.asc().nullsfirst())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def mark_fetched(self, entry: CrawlUrl, response: Dict, document_id=None, content_hash: Optional[str] = None) -> None:
+        first_fetch = entry.last_fetched_at is None or entry.content_hash is None
+        changed = content_hash is not None and content_hash != entry.content_hash
+        entry.status = 'fetched'
+        entry.last_status_code = response['status']
+        entry.etag = response.get('etag') or entry.etag
+        entry.last_modified = response.get('last_modified') or entry.last_modified
+        entry.document_id = document_id or entry.document_id
+        entry.content_hash = content_hash or entry.content_hash
+        entry.failure_count = 0
+        entry.last_fetched_at = utcnow()
+        if first_fetch:
+            self.scheduler.record_first_fetch(entry)
+        elif changed:
+            self.scheduler.record_changed(entry)
+        else:
+            self.scheduler.record_unchanged(entry)
+
+    def mark_unchanged(self, entry: CrawlUrl, response: Dict) -> None:
+        entry.status = 'unchanged'
+        entry.last_status_code = response['status']
+        entry.failure_count = 0
+        entry.last_fetched_at = utcnow()
+        self.scheduler.record_unchanged(entry)
+
+    def mark_failed(self, entry: CrawlUrl, status_code: Optional[int]) -> None:
+        entry.status = 'failed'
+        entry.last_status_code = status_code
+        entry.failure_count = (entry.failure_count or 0) + 1
+        entry.last_fetched_at = utcnow()
+        self.scheduler.record_failed(entry)
+
+    def mark_disallowed(self, entry: CrawlUrl) -> None:
+        entry.status = 'disallowed'
+        entry.last_fetched_at = utcnow()
+        self.scheduler.record_disallowed(entry)
@@ -1,8 +1,10 @@
 from typing import Dict, Type
 import logging
 from .base import BaseScraper
+from .scheduler import due_companies
 from .sites import GoogleScraper, MicrosoftScraper, AppleScraper
 from backend.models import Company
+from backend.utils.clock import utcnow
 from backend.utils.db import SessionLocal
 
 logger = logging.getLogger(__name__)
@@ -26,6 +28,9 @@ class ScraperManager:
             if not company:
                 logger.error(f"Company not found: {company_id}")
                 return False
+            
+            company.last_crawl_started_at = utcnow()
+            self.db.commit()
                 
             scraper_class = self._get_scraper_class(company.domain)
             if not scraper_class:
@@ -40,6 +45,13 @@ class ScraperManager:
             logger.error(f"Scraping failed for company {company_id}: {str(e)}")
             return False
     
+    async def scrape_due(self, limit: int = 10) -> Dict[str, bool]:
+        """Scrape the companies whose frontier URLs are due, most overdue first"""
+        results = {}
+        for company_id in due_companies(self.db, limit=limit, domains=list(self.SCRAPERS)):
+            results[company_id] = await self.scrape_company(company_id)
+        return results
+    
     def _get_scraper_class(self, domain: str) -> Type[BaseScraper]:
         """Get appropriate scraper class for domain"""
         return self.SCRAPERS.get(domain)
\ No newline at end of file
@@ -0,0 +1,134 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import timedelta
+from urllib.parse import urlsplit
+import logging
+import re
+from backend.models import RobotsCache
+from backend.utils.clock import utcnow
+
+logger = logging.getLogger(__name__)
+
+ROBOTS_TTL = timedelta(hours=24)
+# Failed fetches are retried soon so a brief outage does not block a day of crawling
+ROBOTS_ERROR_TTL = timedelta(minutes=30)
+
+class RobotsRules:
+    """Parsed robots.txt groups, matched the RFC 9309 way
+
+    Groups for the crawler's product token are merged (falling back to the
+    `*` groups), the longest matching Allow/Disallow pattern wins with Allow
+    winning ties, and patterns support the `*` and `$` wildcards.
+    """
+
+    def __init__(self, content: str):
+        self.groups: Dict[str, List[Tuple[bool, str]]] = {}
+        self.delays: Dict[str, float] = {}
+        self.sitemaps: List[str] = []
+        agents, in_rules = [], False
+        for line in content.splitlines():
+            key, _, value = line.split('#', 1)[0].partition(':')
+            key, value = key.strip().lower(), value.strip()
+            if key == 'user-agent':
+                if in_rules:
+                    agents, in_rules = [], False
+                agents.append(value.lower())
+                for agent in agents:
+                    self.groups.setdefault(agent, [])
+            elif key in ('allow', 'disallow'):
+                in_rules = True
+                if value:
+                    for agent in agents:
+                        self.groups[agent].append((key == 'allow', value))
+            elif key == 'crawl-delay':
+                in_rules = True
+                try:
+                    delay = float(value)
+                except ValueError:
+                    continue
+                for agent in agents:
+                    self.delays[agent] = delay
+            elif key == 'sitemap' and value:
+                self.sitemaps.append(value)
+
+    def _agent(self, user_agent: str) -> Optional[str]:
+        token = user_agent.lower()
+        if token in self.groups:
+            return token
+        return '*' if '*' in self.groups else None
+
+    @staticmethod
+    def _matches(pattern: str, path: str) -> bool:
+        anchored = pattern.endswith('$')
+        regex = '.*'.join(re.escape(part) for part in pattern.rstrip('$').split('*'))
+        return re.match(regex + ('$' if anchored else ''), path) is not None
+
+    def allowed(self, user_agent: str, url: str) -> bool:
+        parts = urlsplit(url)
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        if path == '/robots.txt':
+            return True
+        agent = self._agent(user_agent)
+        best = None
+        for allow, pattern in self.groups.get(agent, []):
+            if self._matches(pattern, path):
+                candidate = (len(pattern), allow)
+                if best is None or candidate > best:
+                    best = candidate
+        return best is None or best[1]
+
+    def crawl_delay(self, user_agent: str) -> Optional[float]:
+        return self.delays.get(self._agent(user_agent))
+
+class RobotsPolicy:
+    """robots.txt rules for one origin, cached in the robots_cache table
+
+    Rules are matched per RFC 9309 (see RobotsRules). Unavailable files
+    follow it too: a 4xx means no restrictions, a 5xx or network failure
+    means the whole origin is treated as disallowed. The latter is flagged
+    as unavailable so callers can skip the crawl rather than record every
+    URL as disallowed.
+    """
+
+    def __init__(self, user_agent: str, content: Optional[str], status_code: Optional[int]):
+        self.user_agent = user_agent
+        self.rules = RobotsRules('')
+        self.unavailable = False
+        if status_code == 200 and content is not None:
+            self.rules = RobotsRules(content)
+        elif status_code is None or not 400 <= status_code < 500:
+            self.rules = RobotsRules('User-agent: *\nDisallow: /\n')
+            self.unavailable = True
+
+    @classmethod
+    async def load(cls, scraper, url: str) -> 'RobotsPolicy':
+        """Return the policy for url's origin, refetching robots.txt when the cache is stale"""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        cached = scraper.db.query(RobotsCache).get(origin)
+        if cached is None or cached.fetched_at < utcnow() - cls.cache_ttl(cached.status_code):
+            response = await scraper._request(f"{origin}/robots.txt")
+            if cached is None:
+                cached = RobotsCache(origin=origin)
+                scraper.db.add(cached)
+            cached.status_code = response['status']
+            cached.content = response['content']
+            cached.fetched_at = utcnow()
+            scraper.db.commit()
+        return cls(scraper.ROBOTS_USER_AGENT, cached.content, cached.status_code)
+
+    @staticmethod
+    def cache_ttl(status_code: Optional[int]) -> timedelta:
+        if status_code == 200 or (status_code is not None and 400 <= status_code < 500):
+            return ROBOTS_TTL
+        return ROBOTS_ERROR_TTL
+
+    def allowed(self, url: str) -> bool:
+        return self.rules.allowed(self.user_agent, url)
+
+    @property
+    def crawl_delay(self) -> Optional[float]:
+        return self.rules.crawl_delay(self.user_agent)
+
+    @property
+    def sitemaps(self) -> List[str]:
+        return self.rules.sitemaps
@@ -0,0 +1,142 @@
+from typing import List, Optional
+from datetime import datetime, timedelta
+from statistics import median
+from sqlalchemy import func, or_
+import logging
+from backend.models import Company, CrawlUrl, DocumentVersion
+from backend.utils.clock import utcnow
+
+logger = logging.getLogger(__name__)
+
+# Starting revisit interval before any history is known
+INITIAL_INTERVALS = {
+    'daily': timedelta(days=1),
+    'weekly': timedelta(days=7),
+    'monthly': timedelta(days=30)
+}
+
+# How long a company whose crawl left no frontier URLs waits before another attempt
+EMPTY_FRONTIER_RETRY = timedelta(days=1)
+
+BACKOFF_FACTOR = 2.0
+RETRY_BASE = timedelta(minutes=15)
+HISTORY_VERSIONS = 10
+
+class CrawlScheduler:
+    """Learns a revisit interval per URL from its observed change history
+
+    Unchanged fetches back the interval off exponentially; a detected change
+    tightens it to half the document's typical gap between versions or half
+    the current interval, whichever is shorter. Intervals always stay within
+    the company's min/max bounds.
+    """
+
+    def __init__(self, db, company: Optional[Company]):
+        self.db = db
+        frequency = company.scraping_frequency if company else None
+        self.initial_interval = INITIAL_INTERVALS.get(frequency, INITIAL_INTERVALS['weekly'])
+        self.min_interval = timedelta(hours=(company.min_crawl_interval_hours if company else None) or 6)
+        self.max_interval = timedelta(hours=(company.max_crawl_interval_hours if company else None) or 720)
+
+    def _clamp(self, interval: timedelta) -> timedelta:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _current_interval(self, entry: CrawlUrl) -> timedelta:
+        if entry.revisit_interval_seconds:
+            return timedelta(seconds=entry.revisit_interval_seconds)
+        return self._clamp(self.initial_interval)
+
+    def observed_change_interval(self, document_id) -> Optional[timedelta]:
+        """Median gap between the document's recent versions, if it has changed before"""
+        if document_id is None:
+            return None
+        extracted = [
+            row[0] for row in self.db.query(DocumentVersion.extracted_at)
+            .filter(DocumentVersion.document_id == document_id)
+            .order_by(DocumentVersion.version_number.desc())
+            .limit(HISTORY_VERSIONS)
+        ]
+        gaps = [newer - older for newer, older in zip(extracted, extracted[1:]) if newer and older]
+        return median(gaps) if gaps else None
+
+    def _set_interval(self, entry: CrawlUrl, interval: timedelta, now: datetime) -> None:
+        interval = self._clamp(interval)
+        entry.revisit_interval_seconds = int(interval.total_seconds())
+        entry.next_due_at = now + interval
+
+    def record_changed(self, entry: CrawlUrl, now: Optional[datetime] = None) -> None:
+        """A fetch produced a new version: revisit sooner"""
+        now = now or utcnow()
+        observed = self.observed_change_interval(entry.document_id)
+        interval = self._current_interval(entry) / BACKOFF_FACTOR
+        if observed:
+            interval = min(observed / 2, interval)
+        self._set_interval(entry, interval, now)
+
+    def record_unchanged(self, entry: CrawlUrl, now: Optional[datetime] = None) -> None:
+        """A fetch found nothing new: back off exponentially"""
+        now = now or utcnow()
+        self._set_interval(entry, self._current_interval(entry) * BACKOFF_FACTOR, now)
+
+    def record_first_fetch(self, entry: CrawlUrl, now: Optional[datetime] = None) -> None:
+        """First visit: seed from any existing version history, else the company frequency"""
+        now = now or utcnow()
+        observed = self.observed_change_interval(entry.document_id)
+        self._set_interval(entry, observed / 2 if observed else self.initial_interval, now)
+
+    def record_failed(self, entry: CrawlUrl, now: Optional[datetime] = None) -> None:
+        """Retry failures on a short exponential backoff without touching the learned interval"""
+        now = now or utcnow()
+        retry = RETRY_BASE * (BACKOFF_FACTOR ** min(entry.failure_count or 0, 10))
+        entry.next_due_at = now + min(retry, self._current_interval(entry))
+
+    def record_disallowed(self, entry: CrawlUrl, now: Optional[datetime] = None) -> None:
+        """Check robots.txt again only at the slowest rate"""
+        entry.next_due_at = (now or utcnow()) + self.max_interval
+
+def due_filter(now: datetime):
+    return or_(CrawlUrl.next_due_at.is_(None), CrawlUrl.next_due_at <= now)
+
+def due_companies(db, limit: int = 10, now: Optional[datetime] = None,
+                  domains: Optional[List[str]] = None) -> List[str]:
+    """Companies without frontier URLs, then companies with due URLs, most overdue first
+
+    Companies whose last attempt left the frontier empty are retried only after
+    EMPTY_FRONTIER_RETRY, so they cannot hold the first slots forever. Pass the
+    domains that have a scraper to skip companies nothing can crawl.
+    """
+    now = now or utcnow()
+    crawlable = [Company.status == 'active', Company.deleted_at.is_(None)]
+    if domains is not None:
+        crawlable.append(Company.domain.in_(domains))
+
+    never_crawled = [
+        str(row[0]) for row in db.query(Company.id).filter(
+            *crawlable,
+            or_(
+                Company.last_crawl_started_at.is_(None),
+                Company.last_crawl_started_at < now - EMPTY_FRONTIER_RETRY
+            ),
+            ~db.query(CrawlUrl.id).filter(CrawlUrl.company_id == Company.id).exists()
+        ).order_by(
+            Company.last_crawl_started_at.asc().nullsfirst(),
+            Company.scraping_priority.desc()
+        ).limit(limit)
+    ]
+    if len(never_crawled) >= limit:
+        return never_crawled
+
+    rows = (
+        db.query(CrawlUrl.company_id)
+        .join(Company, Company.id == CrawlUrl.company_id)
+        .filter(*crawlable, due_filter(now))
+        .group_by(CrawlUrl.company_id, Company.scraping_priority)
+        .order_by(
+            func.bool_or(CrawlUrl.next_due_at.is_(None)).desc(),
+            func.min(CrawlUrl.next_due_at),
+            Company.scraping_priority.desc()
+        )
+        .limit(limit - len(never_crawled))
+        .all()
+    )
+    return never_crawled + [str(row[0]) for row in rows]
@@ -0,0 +1,46 @@
+from typing import List, Optional, Tuple
+from datetime import datetime, timezone
+import gzip
+import logging
+import xml.etree.ElementTree as ET
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Parse a W3C datetime lastmod into an aware UTC datetime (date-only values are taken as UTC)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def parse_sitemap(content) -> Tuple[List[Tuple[str, Optional[datetime]]], List[str]]:
+    """Parse a sitemap or sitemap index
+
+    Returns (page entries as (loc, lastmod), child sitemap URLs).
+    """
+    if isinstance(content, bytes) and content[:2] == b'\x1f\x8b':
+        content = gzip.decompress(content)
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError as e:
+        logger.error(f"Invalid sitemap: {str(e)}")
+        return [], []
+
+    pages, children = [], []
+    for entry in root:
+        loc = entry.findtext(f'{SITEMAP_NS}loc') or entry.findtext('loc')
+        if not loc:
+            continue
+        lastmod = parse_lastmod(entry.findtext(f'{SITEMAP_NS}lastmod') or entry.findtext('lastmod'))
+        if entry.tag.endswith('sitemap'):
+            children.append(loc.strip())
+        else:
+            pages.append((loc.strip(), lastmod))
+    return pages, children
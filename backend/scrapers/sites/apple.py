@@ -9,6 +9,7 @@ class AppleScraper(BaseScraper):
     """Scraper implementation for Apple's terms and policies"""
     
     BASE_URL = "https://www.apple.com/legal"
+    DOCUMENT_URL_PATTERNS = ['terms-of-service', 'privacy-policy', 'sla', 'terms-conditions']
     
     async def get_document_urls(self) -> List[str]:
         """Get Apple's policy document URLs"""
@@ -21,16 +22,9 @@ class AppleScraper(BaseScraper):
         
         # Find policy links on Apple's legal page
         for link in soup.find_all('a', href=True):
-            href = link['href']
-            if any(term in href.lower() for term in [
-                'terms-of-service', 
-                'privacy-policy',
-                'sla',
-                'terms-conditions'
-            ]):
-                if not href.startswith('http'):
-                    href = f"{self.BASE_URL}/{href.lstrip('/')}"
-                urls.append(href)
+            url = self.absolute_url(link['href'])
+            if self.is_document_url(url):
+                urls.append(url)
                 
         return list(set(urls))
 
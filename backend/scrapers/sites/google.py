@@ -9,6 +9,7 @@ class GoogleScraper(BaseScraper):
     """Scraper implementation for Google's terms and policies"""
     
     BASE_URL = "https://policies.google.com"
+    DOCUMENT_URL_PATTERNS = ['/technologies/', '/privacy', '/terms']
     
     async def get_document_urls(self) -> List[str]:
         """Get Google's policy document URLs"""
@@ -17,8 +18,11 @@ class GoogleScraper(BaseScraper):
             return []
             
         soup = BeautifulSoup(content, 'html.parser')
-        return [f"{self.BASE_URL}{link['href']}" for link in soup.find_all('a', href=True)
-                if any(path in link['href'] for path in ['/technologies/', '/privacy', '/terms'])]
+        urls = [self.absolute_url(link['href']) for link in soup.find_all('a', href=True)]
+        return list(dict.fromkeys(
+            url for url in urls
+            if self.is_document_url(url)
+        ))
 
     async def extract_document_content(self, url: str) -> Dict:
         """Extract content from Google policy pages"""
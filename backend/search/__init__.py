@@ -0,0 +1,12 @@
+from .base import SearchBackend
+from .postgres import PostgresSearchBackend
+from .es_backend import ElasticsearchSearchBackend
+from .indexer import SearchIndexer, get_search_backend
+
+__all__ = [
+    'SearchBackend',
+    'PostgresSearchBackend',
+    'ElasticsearchSearchBackend',
+    'SearchIndexer',
+    'get_search_backend'
+]
@@ -0,0 +1,48 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional
+
+# Long policies are truncated before indexing; Postgres caps a tsvector at 1MB
+# and the opening sections carry almost all of the searchable clauses anyway.
+MAX_INDEXED_CHARS = 500_000
+
+class SearchBackend(ABC):
+    """Base class for full-text search backends over document versions"""
+
+    # Whether index writes join the caller's database transaction. Writes to an
+    # external service do not, so they are queued until the transaction commits.
+    transactional = True
+
+    @abstractmethod
+    def index_version(self, entry: Dict) -> None:
+        """Index (or replace) the current version of a single document"""
+        pass
+
+    @abstractmethod
+    def bulk_index(self, entries: Iterable[Dict]) -> int:
+        """Index many documents at once and return the number indexed"""
+        pass
+
+    @abstractmethod
+    def search(
+        self,
+        query: str,
+        company_id: Optional[str] = None,
+        document_type: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 20
+    ) -> Dict:
+        """Run a ranked, paginated query and return hits with a total count"""
+        pass
+
+    @staticmethod
+    def build_entry(version) -> Dict:
+        """Flatten a DocumentVersion and its Document into an index entry"""
+        document = version.document
+        return {
+            'document_id': str(document.id),
+            'document_version_id': str(version.id),
+            'company_id': str(document.company_id),
+            'document_type': document.document_type,
+            'title': document.title or '',
+            'content': (version.content or '')[:MAX_INDEXED_CHARS]
+        }
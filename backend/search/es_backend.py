@@ -0,0 +1,108 @@
+from typing import Dict, Iterable, Optional
+import os
+import logging
+from .base import SearchBackend
+
+try:
+    from elasticsearch import Elasticsearch
+    from elasticsearch.helpers import bulk
+except ImportError:  # Elasticsearch is optional; Postgres FTS is the default
+    Elasticsearch = None
+    bulk = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAPPINGS = {
+    'properties': {
+        'document_id': {'type': 'keyword'},
+        'document_version_id': {'type': 'keyword'},
+        'company_id': {'type': 'keyword'},
+        'document_type': {'type': 'keyword'},
+        'title': {'type': 'text', 'analyzer': 'english'},
+        'content': {'type': 'text', 'analyzer': 'english'}
+    }
+}
+
+class ElasticsearchSearchBackend(SearchBackend):
+    """Full-text search backed by the Elasticsearch service from docker-compose"""
+
+    transactional = False
+
+    def __init__(self, url: Optional[str] = None, index_name: str = 'document_versions'):
+        if Elasticsearch is None:
+            raise RuntimeError("elasticsearch package is not installed")
+        self.client = Elasticsearch(url or os.getenv("ELASTICSEARCH_URL", "http://localhost:9200"))
+        self.index_name = index_name
+        # Without the explicit mapping Elasticsearch would map ids as analyzed text
+        # and the term filters in search() would never match
+        try:
+            self.ensure_index()
+        except Exception as e:
+            logger.error(f"Failed to create search index {self.index_name}: {str(e)}")
+
+    def ensure_index(self) -> None:
+        """Create the index with English analyzers if it does not exist"""
+        if not self.client.indices.exists(index=self.index_name):
+            self.client.indices.create(index=self.index_name, mappings=INDEX_MAPPINGS)
+
+    def index_version(self, entry: Dict) -> None:
+        """Index a single document, keyed by document id so newer versions replace older ones"""
+        self.client.index(index=self.index_name, id=entry['document_id'], document=entry)
+
+    def bulk_index(self, entries: Iterable[Dict]) -> int:
+        """Stream documents through the bulk helper"""
+        actions = (
+            {'_index': self.index_name, '_id': entry['document_id'], '_source': entry}
+            for entry in entries
+        )
+        indexed, errors = bulk(self.client, actions, raise_on_error=False)
+        if errors:
+            logger.error(f"Bulk indexing reported {len(errors)} errors")
+        return indexed
+
+    def search(
+        self,
+        query: str,
+        company_id: Optional[str] = None,
+        document_type: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 20
+    ) -> Dict:
+        """Run a multi_match query with title boosting and highlighted snippets"""
+        filters = []
+        if company_id:
+            filters.append({'term': {'company_id': company_id}})
+        if document_type:
+            filters.append({'term': {'document_type': document_type}})
+
+        response = self.client.search(
+            index=self.index_name,
+            query={
+                'bool': {
+                    'must': {'multi_match': {'query': query, 'fields': ['title^3', 'content']}},
+                    'filter': filters
+                }
+            },
+            highlight={'fields': {'content': {'fragment_size': 200, 'number_of_fragments': 2}}},
+            source_excludes=['content'],
+            from_=(page - 1) * page_size,
+            size=page_size
+        )
+        hits = response['hits']
+        return {
+            'total': hits['total']['value'],
+            'page': page,
+            'page_size': page_size,
+            'results': [
+                {
+                    'document_id': hit['_source']['document_id'],
+                    'document_version_id': hit['_source']['document_version_id'],
+                    'company_id': hit['_source']['company_id'],
+                    'document_type': hit['_source']['document_type'],
+                    'title': hit['_source']['title'],
+                    'score': hit['_score'],
+                    'snippet': ' ... '.join(hit.get('highlight', {}).get('content', []))
+                }
+                for hit in hits['hits']
+            ]
+        }
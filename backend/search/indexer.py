@@ -0,0 +1,98 @@
+from typing import Dict, List, Optional
+from functools import lru_cache
+import os
+import logging
+from sqlalchemy.orm import joinedload
+from backend.models import Document, DocumentVersion
+from .base import SearchBackend
+from .postgres import PostgresSearchBackend
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def _elasticsearch_backend() -> SearchBackend:
+    # One client (and one index existence check) per process, not per request
+    from .es_backend import ElasticsearchSearchBackend
+    return ElasticsearchSearchBackend()
+
+def get_search_backend(db) -> SearchBackend:
+    """Return the configured search backend (SEARCH_BACKEND=postgres|elasticsearch)"""
+    backend = os.getenv("SEARCH_BACKEND", "postgres")
+    if backend == "elasticsearch":
+        return _elasticsearch_backend()
+    return PostgresSearchBackend(db)
+
+class SearchIndexer:
+    """Feeds document versions into the search backend
+
+    Transactional backends are written inside the ingestion transaction. For
+    the others, entries wait in a queue that the caller flushes after commit
+    or discards on rollback, so a rolled-back version never becomes a hit.
+    """
+
+    def __init__(self, db, backend: Optional[SearchBackend] = None):
+        self.db = db
+        self.backend = backend or get_search_backend(db)
+        self._pending: List[Dict] = []
+
+    def index_version(self, version: DocumentVersion) -> None:
+        """Index a newly ingested version; called from the ingestion path"""
+        if not self.backend.transactional:
+            self._pending.append(SearchBackend.build_entry(version))
+            return
+        try:
+            # Savepoint so a failed upsert does not abort the ingestion transaction
+            with self.db.begin_nested():
+                self.backend.index_version(SearchBackend.build_entry(version))
+        except Exception as e:
+            # Search is derived data; a failed index must not fail ingestion
+            logger.error(f"Failed to index version {version.id}: {str(e)}")
+
+    def flush(self) -> None:
+        """Write queued entries once the transaction that created them has committed"""
+        for entry in self._pending:
+            try:
+                self.backend.index_version(entry)
+            except Exception as e:
+                logger.error(f"Failed to index version {entry['document_version_id']}: {str(e)}")
+        self._pending.clear()
+
+    def discard(self) -> None:
+        """Drop queued entries after a rollback"""
+        self._pending.clear()
+
+    def backfill(self, batch_size: int = 500) -> int:
+        """Bulk index the current version of every document in keyset-paginated batches"""
+        total = 0
+        last_document_id = None
+        while True:
+            query = (
+                self.db.query(DocumentVersion)
+                .join(Document, Document.current_version_id == DocumentVersion.id)
+                .options(joinedload(DocumentVersion.document))
+                .order_by(DocumentVersion.document_id)
+            )
+            if last_document_id is not None:
+                query = query.filter(DocumentVersion.document_id > last_document_id)
+            versions = query.limit(batch_size).all()
+            if not versions:
+                break
+
+            total += self.backend.bulk_index(SearchBackend.build_entry(v) for v in versions)
+            self.db.commit()
+            last_document_id = versions[-1].document_id
+            # Release the batch so memory stays flat across the backfill
+            self.db.expunge_all()
+
+        logger.info(f"Backfilled {total} documents into search index")
+        return total
+
+if __name__ == "__main__":
+    from backend.utils.db import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        SearchIndexer(db).backfill()
+    finally:
+        db.close()
@@ -0,0 +1,115 @@
+from typing import Dict, Iterable, Optional
+from sqlalchemy import text
+import logging
+from .base import SearchBackend
+
+logger = logging.getLogger(__name__)
+
+UPSERT_SQL = text("""
+    INSERT INTO document_search_index (
+        document_id, document_version_id, company_id, document_type, title, search_vector, indexed_at
+    )
+    VALUES (
+        :document_id, :document_version_id, :company_id, :document_type, :title,
+        setweight(to_tsvector('english', :title), 'A') ||
+        setweight(to_tsvector('english', :content), 'B'),
+        NOW()
+    )
+    ON CONFLICT (document_id) DO UPDATE SET
+        document_version_id = EXCLUDED.document_version_id,
+        document_type = EXCLUDED.document_type,
+        title = EXCLUDED.title,
+        search_vector = EXCLUDED.search_vector,
+        indexed_at = EXCLUDED.indexed_at
+""")
+
+# Ranking and pagination happen over the GIN-filtered candidate set only; the
+# snippet is generated for the returned page, never for the whole match set.
+SEARCH_SQL = """
+    WITH matches AS (
+        SELECT s.document_id, s.document_version_id, s.company_id, s.document_type, s.title,
+               ts_rank_cd(s.search_vector, q.query) AS rank,
+               COUNT(*) OVER () AS total
+        FROM document_search_index s, websearch_to_tsquery('english', :query) AS q(query)
+        WHERE s.search_vector @@ q.query {filters}
+        ORDER BY rank DESC, s.document_id
+        LIMIT :limit OFFSET :offset
+    )
+    SELECT m.*,
+           ts_headline('english', LEFT(v.content, 50000), websearch_to_tsquery('english', :query),
+                       'MaxFragments=2, MaxWords=30, MinWords=10') AS snippet
+    FROM matches m
+    JOIN document_versions v ON v.id = m.document_version_id
+    ORDER BY m.rank DESC, m.document_id
+"""
+
+# Only needed for pages past the end, where the window count has no row to ride on
+COUNT_SQL = """
+    SELECT COUNT(*)
+    FROM document_search_index s, websearch_to_tsquery('english', :query) AS q(query)
+    WHERE s.search_vector @@ q.query {filters}
+"""
+
+class PostgresSearchBackend(SearchBackend):
+    """Full-text search backed by a Postgres tsvector column and GIN index"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def index_version(self, entry: Dict) -> None:
+        """Upsert a single document into the search index"""
+        self.db.execute(UPSERT_SQL, entry)
+
+    def bulk_index(self, entries: Iterable[Dict]) -> int:
+        """Upsert a batch of documents with a single executemany round trip"""
+        entries = list(entries)
+        if entries:
+            self.db.execute(UPSERT_SQL, entries)
+        return len(entries)
+
+    def search(
+        self,
+        query: str,
+        company_id: Optional[str] = None,
+        document_type: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 20
+    ) -> Dict:
+        """Rank matching documents with ts_rank_cd and return one page of hits"""
+        params = {
+            'query': query,
+            'limit': page_size,
+            'offset': (page - 1) * page_size
+        }
+        filters = ''
+        if company_id:
+            filters += ' AND s.company_id = :company_id'
+            params['company_id'] = company_id
+        if document_type:
+            filters += ' AND s.document_type = :document_type'
+            params['document_type'] = document_type
+
+        rows = self.db.execute(text(SEARCH_SQL.format(filters=filters)), params).mappings().all()
+        if rows:
+            total = rows[0]['total']
+        elif params['offset'] > 0:
+            total = self.db.execute(text(COUNT_SQL.format(filters=filters)), params).scalar()
+        else:
+            total = 0
+        return {
+            'total': total,
+            'page': page,
+            'page_size': page_size,
+            'results': [
+                {
+                    'document_id': str(row['document_id']),
+                    'document_version_id': str(row['document_version_id']),
+                    'company_id': str(row['company_id']),
+                    'document_type': row['document_type'],
+                    'title': row['title'],
+                    'score': float(row['rank']),
+                    'snippet': row['snippet']
+                }
+                for row in rows
+            ]
+        }
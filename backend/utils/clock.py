@@ -0,0 +1,5 @@
+from datetime import datetime, timezone
+
+def utcnow() -> datetime:
+    """Timezone-aware current UTC time, comparable with timestamptz values read back from Postgres"""
+    return datetime.now(timezone.utc)
@@ -1,8 +1,98 @@
 import json
+import random
+import re
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
 import uuid
 
+DOCUMENT_TYPES = ['terms_of_service', 'privacy_policy', 'eula']
+
+# Sentence templates per section; placeholders are filled per company so
+# boilerplate is near-identical across companies, as it is in the wild
+CLAUSE_LIBRARY = {
+    'Acceptance of Terms': [
+        "By accessing or using the services provided by {company}, you agree to be bound by these terms.",
+        "If you do not agree to these terms, you may not access or use the services.",
+        "You must be at least {age} years old to use the services.",
+        "If you are using the services on behalf of an organization, you represent that you have authority to bind that organization."
+    ],
+    'Information We Collect': [
+        "We collect information you provide directly to us, such as your name, email address and payment information.",
+        "We automatically collect device identifiers, IP addresses, browser type and usage data when you use the services.",
+        "We may receive information about you from third parties, including advertising partners and data brokers.",
+        "We use cookies, web beacons and similar technologies to collect information about your interactions with the services.",
+        "We may collect precise location information from your device with your consent."
+    ],
+    'How We Use Information': [
+        "We use the information we collect to provide, maintain and improve the services.",
+        "We may use your information to personalize content and advertising shown to you.",
+        "We may combine information collected across our services and devices.",
+        "We use information to detect, investigate and prevent fraudulent transactions and other illegal activities."
+    ],
+    'Sharing of Information': [
+        "We may share your personal information with affiliates and service providers who perform services on our behalf.",
+        "We may disclose information if we believe disclosure is required by law or legal process.",
+        "In connection with a merger, sale of assets or acquisition, your information may be transferred to the acquiring entity.",
+        "We may share aggregated or de-identified information that cannot reasonably be used to identify you."
+    ],
+    'Data Retention': [
+        "We retain personal information for as long as necessary to provide the services and for {days} days thereafter.",
+        "We may retain certain information as required by law or for legitimate business purposes.",
+        "You may request deletion of your account at any time through your account settings."
+    ],
+    'License Grant': [
+        "Subject to these terms, {company} grants you a limited, non-exclusive, non-transferable, revocable license to use the software.",
+        "You may not copy, modify, distribute, sell or lease any part of the services or included software.",
+        "You may not reverse engineer or attempt to extract the source code of the software, unless laws prohibit those restrictions.",
+        "All rights not expressly granted to you are reserved by {company} and its licensors."
+    ],
+    'User Content': [
+        "You retain ownership of any intellectual property rights that you hold in content you submit.",
+        "You grant {company} a worldwide, royalty-free license to use, host, store, reproduce, modify and distribute your content.",
+        "This license continues even if you stop using the services.",
+        "We may remove content that we believe violates these terms or applicable law."
+    ],
+    'Termination': [
+        "We may suspend or terminate your access to the services at any time, with or without cause or notice.",
+        "Upon termination, your right to use the services will immediately cease.",
+        "Provisions that by their nature should survive termination shall survive termination."
+    ],
+    'Disclaimer of Warranties': [
+        "The services are provided as is and as available without warranties of any kind, either express or implied.",
+        "{company} does not warrant that the services will be uninterrupted, secure or error-free.",
+        "Some jurisdictions do not allow the exclusion of implied warranties, so the above exclusion may not apply to you."
+    ],
+    'Limitation of Liability': [
+        "To the maximum extent permitted by law, {company} shall not be liable for any indirect, incidental, special, consequential or punitive damages.",
+        "Our total liability for any claim arising out of these terms shall not exceed the greater of {amount} dollars or the amount you paid us in the past twelve months.",
+        "These limitations apply regardless of the legal theory on which the claim is based."
+    ],
+    'Dispute Resolution': [
+        "Any dispute arising out of or relating to these terms shall be resolved by binding individual arbitration.",
+        "You waive any right to participate in a class action lawsuit or class-wide arbitration.",
+        "You may opt out of this arbitration agreement by notifying us in writing within {days} days of accepting these terms.",
+        "The arbitration shall be administered by the American Arbitration Association under its consumer arbitration rules."
+    ],
+    'Governing Law': [
+        "These terms are governed by the laws of the State of {state}, without regard to conflict of law principles.",
+        "Any claims not subject to arbitration shall be brought exclusively in the courts located in {state}."
+    ],
+    'Changes to These Terms': [
+        "We may modify these terms at any time by posting the revised terms on our website.",
+        "Your continued use of the services after changes become effective constitutes acceptance of the revised terms.",
+        "We will notify you of material changes at least {notice} days before they take effect."
+    ]
+}
+
+FILLER_SENTENCES = [
+    "For more information, please contact us using the details provided below.",
+    "This section applies only to the extent permitted by applicable law.",
+    "Capitalized terms not defined in this section have the meanings given elsewhere in these terms.",
+    "Nothing in this section limits any rights you may have under applicable consumer protection laws."
+]
+
+STATES = ['California', 'Delaware', 'New York', 'Washington', 'Texas']
+
 def generate_test_data() -> Dict:
     """Generate sample test data for scrapers"""
     return {
@@ -37,4 +127,96 @@ def save_test_data(output_dir: str = "tests/fixtures"):
     
     test_data = generate_test_data()
     with open(f"{output_dir}/sample_documents.json", "w") as f:
-        json.dump(test_data, f, indent=2)
\ No newline at end of file
+        json.dump(test_data, f, indent=2)
+
+def policy_params(rng: random.Random, company: str) -> Dict:
+    """Values for the clause library placeholders, fixed per document"""
+    return {
+        'company': company,
+        'age': rng.choice([13, 16, 18]),
+        'days': rng.choice([30, 60, 90, 180]),
+        'amount': rng.choice([50, 100, 500]),
+        'notice': rng.choice([7, 14, 30]),
+        'state': rng.choice(STATES)
+    }
+
+def generate_policy(rng: random.Random, company: str, sections: int = 12, params: Optional[Dict] = None) -> str:
+    """Generate a multi-section policy document from the clause library"""
+    params = params or policy_params(rng, company)
+    titles = rng.sample(list(CLAUSE_LIBRARY), min(sections, len(CLAUSE_LIBRARY)))
+    while len(titles) < sections:
+        titles.append(rng.choice(list(CLAUSE_LIBRARY)))
+
+    parts = []
+    for number, title in enumerate(titles, 1):
+        parts.append(f"{number}. {title}")
+        for _ in range(rng.randint(2, 4)):
+            sentences = rng.sample(CLAUSE_LIBRARY[title], rng.randint(1, len(CLAUSE_LIBRARY[title])))
+            if rng.random() < 0.3:
+                sentences.append(rng.choice(FILLER_SENTENCES))
+            parts.append(' '.join(sentences).format(**params))
+    return '\n\n'.join(parts)
+
+def mutate_policy(text: str, edit_rate: float, rng: random.Random, params: Dict) -> str:
+    """Produce the next version of a policy by editing roughly edit_rate of its sentences
+
+    Each edited sentence is replaced, deleted or followed by an inserted
+    sentence with equal probability; new sentences use the document's params.
+    """
+    all_sentences = [
+        sentence.format(**params) for clauses in CLAUSE_LIBRARY.values() for sentence in clauses
+    ]
+    paragraphs = []
+    for paragraph in text.split('\n\n'):
+        sentences = []
+        for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+            if rng.random() >= edit_rate:
+                sentences.append(sentence)
+                continue
+            action = rng.choice(['replace', 'delete', 'insert'])
+            if action == 'replace':
+                sentences.append(rng.choice(all_sentences))
+            elif action == 'insert':
+                sentences.extend([sentence, rng.choice(all_sentences)])
+        paragraphs.append(' '.join(sentences))
+    return '\n\n'.join(p for p in paragraphs if p)
+
+def generate_corpus(
+    num_companies: int = 100,
+    documents_per_company: int = 3,
+    versions_per_document: int = 3,
+    edit_rate: float = 0.05,
+    sections: Tuple[int, int] = (8, 20),
+    seed: int = 42
+) -> Iterator[Dict]:
+    """Yield a deterministic synthetic corpus of versioned policy documents
+
+    Documents are generated lazily so corpora of any size stream in constant memory.
+    """
+    rng = random.Random(seed)
+    for company_number in range(num_companies):
+        company = f"Example Company {company_number}"
+        for document_number in range(documents_per_company):
+            document_type = DOCUMENT_TYPES[document_number % len(DOCUMENT_TYPES)]
+            params = policy_params(rng, company)
+            content = generate_policy(rng, company, rng.randint(*sections), params=params)
+            for version in range(1, versions_per_document + 1):
+                if version > 1:
+                    content = mutate_policy(content, edit_rate, rng, params)
+                yield {
+                    'company': company,
+                    'document_type': document_type,
+                    'document_key': f"{company_number}-{document_number}",
+                    'version': version,
+                    'content': content
+                }
+
+def save_corpus(output_path: str = "tests/fixtures/corpus.jsonl", **kwargs) -> int:
+    """Write a synthetic corpus as JSON lines and return the number of versions written"""
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(output_path, "w") as f:
+        for record in generate_corpus(**kwargs):
+            f.write(json.dumps(record) + "\n")
+            count += 1
+    return count
\ No newline at end of file
@@ -0,0 +1,204 @@
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from collections import defaultdict
+from functools import wraps
+from pathlib import Path
+from typing import Dict, Optional
+from datetime import datetime
+import asyncio
+import inspect
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds for the exported latency histograms
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_enabled = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+_current_span: ContextVar[Optional['Span']] = ContextVar('current_span', default=None)
+
+class MetricsRegistry:
+    """Thread-safe per-name latency histograms shared by spans and request logging"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.totals: Dict[str, float] = defaultdict(float)
+        self.maxima: Dict[str, float] = defaultdict(float)
+        self.buckets: Dict[str, list] = defaultdict(lambda: [0] * len(BUCKETS))
+
+    def observe(self, name: str, duration: float) -> None:
+        with self._lock:
+            self.counts[name] += 1
+            self.totals[name] += duration
+            self.maxima[name] = max(self.maxima[name], duration)
+            counts = self.buckets[name]
+            for i, bound in enumerate(BUCKETS):
+                if duration <= bound:
+                    counts[i] += 1
+                    break
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                name: {
+                    'count': self.counts[name],
+                    'total_s': round(self.totals[name], 6),
+                    'mean_ms': round(self.totals[name] / self.counts[name] * 1000, 3),
+                    'max_ms': round(self.maxima[name] * 1000, 3)
+                }
+                for name in self.counts
+            }
+
+    def render_prometheus(self) -> str:
+        """Render all histograms in the Prometheus text exposition format"""
+        lines = [
+            "# HELP eula_span_duration_seconds Duration of traced operations",
+            "# TYPE eula_span_duration_seconds histogram"
+        ]
+        with self._lock:
+            for name in sorted(self.counts):
+                cumulative = 0
+                for bound, count in zip(BUCKETS, self.buckets[name]):
+                    cumulative += count
+                    lines.append(f'eula_span_duration_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'eula_span_duration_seconds_bucket{{span="{name}",le="+Inf"}} {self.counts[name]}')
+                lines.append(f'eula_span_duration_seconds_sum{{span="{name}"}} {self.totals[name]:.6f}')
+                lines.append(f'eula_span_duration_seconds_count{{span="{name}"}} {self.counts[name]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts.clear()
+            self.totals.clear()
+            self.maxima.clear()
+            self.buckets.clear()
+
+metrics = MetricsRegistry()
+
+class Span:
+    """A timed operation; child durations are rolled up into the parent's breakdown"""
+
+    __slots__ = ('name', 'attributes', 'parent', 'start', 'duration', 'breakdown')
+
+    def __init__(self, name: str, attributes: Dict, parent: Optional['Span']):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.breakdown: Dict[str, float] = defaultdict(float)
+
+    def summary(self) -> str:
+        parts = ', '.join(
+            f"{name} {seconds:.3f}s"
+            for name, seconds in sorted(self.breakdown.items(), key=lambda item: -item[1])
+        )
+        attrs = ' '.join(f"{key}={value}" for key, value in self.attributes.items())
+        return f"{self.name} {attrs} took {self.duration:.3f}s ({parts or 'no child spans'})"
+
+def enable_tracing(enabled: bool = True) -> None:
+    """Toggle tracing at runtime (also controlled by TRACING_ENABLED)"""
+    global _enabled
+    _enabled = enabled
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+_NOOP_SPAN = nullcontext()
+
+@contextmanager
+def _recording_span(name: str, attributes: Dict, log_summary: bool):
+    parent = _current_span.get()
+    current = Span(name, attributes, parent)
+    token = _current_span.set(current)
+    try:
+        yield current
+    finally:
+        current.duration = time.perf_counter() - current.start
+        _current_span.reset(token)
+        metrics.observe(name, current.duration)
+        if parent is not None:
+            parent.breakdown[name] += current.duration
+            for child_name, seconds in current.breakdown.items():
+                parent.breakdown[child_name] += seconds
+        if log_summary:
+            logger.info(current.summary())
+
+def span(name: str, log_summary: bool = False, **attributes):
+    """Time a block as a named span; a no-op context manager when tracing is disabled
+
+    Set log_summary on job-level spans to log where their time went by child span.
+    """
+    if not _enabled:
+        return _NOOP_SPAN
+    return _recording_span(name, attributes, log_summary)
+
+def traced(name: str):
+    """Decorator form of span() for sync and async callables"""
+    def decorator(f):
+        if asyncio.iscoroutinefunction(inspect.unwrap(f)):
+            @wraps(f)
+            async def async_wrapped(*args, **kwargs):
+                if not _enabled:
+                    return await f(*args, **kwargs)
+                with _recording_span(name, {}, False):
+                    return await f(*args, **kwargs)
+            return async_wrapped
+
+        @wraps(f)
+        def wrapped(*args, **kwargs):
+            if not _enabled:
+                return f(*args, **kwargs)
+            with _recording_span(name, {}, False):
+                return f(*args, **kwargs)
+        return wrapped
+    return decorator
+
+@contextmanager
+def profile_job(job_name: str):
+    """Dump a sampling or deterministic profile of a job to PROFILE_DIR
+
+    Profiling is off unless PROFILE_DIR is set; PROFILE_SAMPLE_RATE (default 1.0)
+    picks the fraction of jobs profiled. pyinstrument is used when installed and
+    PROFILER=pyinstrument, otherwise cProfile.
+    """
+    profile_dir = os.getenv("PROFILE_DIR")
+    if not profile_dir or random.random() >= float(os.getenv("PROFILE_SAMPLE_RATE", "1.0")):
+        yield
+        return
+
+    Path(profile_dir).mkdir(parents=True, exist_ok=True)
+    stem = Path(profile_dir) / f"{job_name}-{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}"
+
+    profiler = None
+    if os.getenv("PROFILER") == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+            profiler = Profiler(async_mode='enabled')
+        except ImportError:
+            logger.warning("pyinstrument not installed, falling back to cProfile")
+
+    if profiler is not None:
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            Path(f"{stem}.html").write_text(profiler.output_html())
+            logger.info(f"Wrote profile {stem}.html")
+        return
+
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(f"{stem}.prof")
+        logger.info(f"Wrote profile {stem}.prof")
@@ -0,0 +1,16 @@
+-- Full-text search index over the current version of each document.
+-- Populated incrementally by the scrapers and backfilled with
+-- `python -m backend.search.indexer`.
+
+CREATE TABLE IF NOT EXISTS document_search_index (
+    document_id UUID PRIMARY KEY REFERENCES documents(id),
+    document_version_id UUID NOT NULL REFERENCES document_versions(id),
+    company_id UUID NOT NULL REFERENCES companies(id),
+    document_type VARCHAR(50) NOT NULL,
+    title VARCHAR(500),
+    search_vector TSVECTOR NOT NULL,
+    indexed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_search_vector ON document_search_index USING gin(search_vector);
+CREATE INDEX IF NOT EXISTS idx_search_company_type ON document_search_index(company_id, document_type);
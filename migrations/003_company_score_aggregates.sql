@@ -0,0 +1,23 @@
+-- Precomputed per-company/per-document-type scores for the comparison API.
+-- Refreshed incrementally whenever DocumentVersion or DocumentAnalysis rows
+-- are flushed (backend/models/aggregates.py); full rebuild with
+-- `python -m backend.models.aggregates`, which should also run on a schedule
+-- (`--every-hours 24`) so changes_last_90_days ages out for idle groups.
+
+CREATE TABLE IF NOT EXISTS company_score_aggregates (
+    company_id UUID NOT NULL REFERENCES companies(id),
+    document_type VARCHAR(50) NOT NULL,
+    document_count INTEGER NOT NULL,
+    overall_score DECIMAL(4,2),
+    complexity_score DECIMAL(4,2),
+    readability_score DECIMAL(4,2),
+    sentiment_score DECIMAL(4,2),
+    confidence_level DECIMAL(3,2),
+    version_count INTEGER NOT NULL,
+    changes_last_90_days INTEGER NOT NULL,
+    last_changed_at TIMESTAMP WITH TIME ZONE,
+    last_analyzed_at TIMESTAMP WITH TIME ZONE,
+    refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    PRIMARY KEY (company_id, document_type)
+);
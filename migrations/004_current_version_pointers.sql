@@ -0,0 +1,42 @@
+-- Maintained pointers to each document's current version and latest analysis,
+-- plus the indexes the ingestion, comparison and change detection paths rely on.
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS current_version_id UUID;
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS latest_analysis_id UUID;
+
+-- Indexes first so the correlated backfill below uses them
+CREATE INDEX IF NOT EXISTS idx_documents_company ON documents(company_id);
+CREATE INDEX IF NOT EXISTS idx_documents_company_type ON documents(company_id, document_type, status);
+CREATE INDEX IF NOT EXISTS idx_documents_company_url ON documents(company_id, source_url);
+
+-- document_id lookups and ORDER BY version_number DESC scans use the index behind
+-- the existing UNIQUE(document_id, version_number); a second one would only slow inserts
+DROP INDEX IF EXISTS uq_document_versions_document_number;
+CREATE INDEX IF NOT EXISTS idx_document_versions_hash ON document_versions(content_hash);
+CREATE INDEX IF NOT EXISTS idx_analysis_version ON document_analysis(document_version_id);
+
+-- Backfill pointers from existing history
+UPDATE documents d SET current_version_id = (
+    SELECT dv.id FROM document_versions dv
+    WHERE dv.document_id = d.id
+    ORDER BY dv.version_number DESC
+    LIMIT 1
+);
+UPDATE documents d SET latest_analysis_id = (
+    SELECT da.id FROM document_analysis da
+    WHERE da.document_version_id = d.current_version_id
+    ORDER BY da.analyzed_at DESC
+    LIMIT 1
+);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fk_documents_current_version') THEN
+        ALTER TABLE documents ADD CONSTRAINT fk_documents_current_version
+            FOREIGN KEY (current_version_id) REFERENCES document_versions(id);
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fk_documents_latest_analysis') THEN
+        ALTER TABLE documents ADD CONSTRAINT fk_documents_latest_analysis
+            FOREIGN KEY (latest_analysis_id) REFERENCES document_analysis(id);
+    END IF;
+END $$;
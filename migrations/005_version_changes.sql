@@ -0,0 +1,30 @@
+-- Change feed between consecutive document versions. Rows are queued as
+-- 'pending' on ingestion and diffed once by backend/analysis/diff_worker.py.
+-- opcodes holds non-equal [tag, i1, i2, j1, j2] character ranges only.
+
+CREATE TABLE IF NOT EXISTS version_changes (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    document_id UUID NOT NULL REFERENCES documents(id),
+    old_version_id UUID NOT NULL REFERENCES document_versions(id),
+    new_version_id UUID NOT NULL UNIQUE REFERENCES document_versions(id),
+    status VARCHAR(20) NOT NULL DEFAULT 'pending', -- pending, done, failed
+    similarity DECIMAL(5,4),
+    chars_added INTEGER,
+    chars_removed INTEGER,
+    opcodes JSON,
+    error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    processed_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_version_changes_document ON version_changes(document_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_version_changes_pending ON version_changes(created_at) WHERE status = 'pending';
+
+-- Seed the feed with existing consecutive version pairs
+INSERT INTO version_changes (document_id, old_version_id, new_version_id)
+SELECT newer.document_id, older.id, newer.id
+FROM document_versions newer
+JOIN document_versions older
+  ON older.document_id = newer.document_id
+ AND older.version_number = newer.version_number - 1
+ON CONFLICT (new_version_id) DO NOTHING;
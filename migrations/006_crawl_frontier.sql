@@ -0,0 +1,28 @@
+-- Persistent per-company crawl frontier and cached robots.txt rules, so crawls
+-- checkpoint per document, resume after a crash and skip unchanged URLs.
+
+CREATE TABLE IF NOT EXISTS crawl_frontier (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    company_id UUID NOT NULL REFERENCES companies(id),
+    url TEXT NOT NULL,
+    source VARCHAR(20) NOT NULL, -- sitemap, landing
+    status VARCHAR(20) NOT NULL DEFAULT 'pending', -- pending, fetched, unchanged, failed, disallowed
+    document_id UUID REFERENCES documents(id),
+    sitemap_lastmod TIMESTAMP WITH TIME ZONE,
+    etag TEXT,
+    last_modified TEXT, -- Last-Modified header, replayed as If-Modified-Since
+    content_hash VARCHAR(64),
+    last_status_code INTEGER,
+    failure_count INTEGER NOT NULL DEFAULT 0,
+    discovered_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    last_fetched_at TIMESTAMP WITH TIME ZONE,
+
+    UNIQUE(company_id, url)
+);
+
+CREATE TABLE IF NOT EXISTS robots_cache (
+    origin VARCHAR(255) PRIMARY KEY,
+    status_code INTEGER,
+    content TEXT,
+    fetched_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
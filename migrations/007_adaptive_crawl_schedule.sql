@@ -0,0 +1,29 @@
+-- Adaptive revisit scheduling: each frontier URL carries a learned revisit
+-- interval and the time it is next due, bounded per company.
+
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS min_crawl_interval_hours INTEGER NOT NULL DEFAULT 6;
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS max_crawl_interval_hours INTEGER NOT NULL DEFAULT 720;
+-- Lets companies whose discovery finds nothing yield to companies with due URLs
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS last_crawl_started_at TIMESTAMP WITH TIME ZONE;
+
+ALTER TABLE crawl_frontier ADD COLUMN IF NOT EXISTS revisit_interval_seconds INTEGER;
+ALTER TABLE crawl_frontier ADD COLUMN IF NOT EXISTS next_due_at TIMESTAMP WITH TIME ZONE;
+
+CREATE INDEX IF NOT EXISTS idx_crawl_frontier_due ON crawl_frontier(next_due_at, company_id);
+
+-- Seed existing URLs from the company's fixed scraping frequency
+UPDATE crawl_frontier f
+SET revisit_interval_seconds = CASE c.scraping_frequency
+        WHEN 'daily' THEN 86400
+        WHEN 'monthly' THEN 2592000
+        ELSE 604800
+    END,
+    next_due_at = f.last_fetched_at + CASE c.scraping_frequency
+        WHEN 'daily' THEN INTERVAL '1 day'
+        WHEN 'monthly' THEN INTERVAL '30 days'
+        ELSE INTERVAL '7 days'
+    END
+FROM companies c
+WHERE c.id = f.company_id
+  AND f.last_fetched_at IS NOT NULL
+  AND f.next_due_at IS NULL;
@@ -0,0 +1,15 @@
+-- Validators for each company's sitemaps, so discovery refetches them with
+-- If-None-Match / If-Modified-Since and walks unchanged indexes from the
+-- stored child list instead of downloading every sitemap on every crawl.
+
+CREATE TABLE IF NOT EXISTS sitemap_cache (
+    company_id UUID NOT NULL REFERENCES companies(id),
+    url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    children JSON, -- child sitemap URLs when the sitemap is an index
+    document_count INTEGER NOT NULL DEFAULT 0, -- policy URLs it listed last time
+    fetched_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    PRIMARY KEY (company_id, url)
+);
@@ -0,0 +1,89 @@
+from pathlib import Path
+import importlib.util
+import sys
+from sqlalchemy import inspect
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def _load_models_package() -> None:
+    """Register backend/models/_init.py as the backend.models package
+
+    The package keeps its exports in _init.py rather than __init__.py, so a
+    plain import yields an empty namespace package; load it explicitly so
+    `from backend.models import ...` resolves in tests.
+    """
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    if getattr(sys.modules.get('backend.models'), 'Base', None) is not None:
+        return
+    package_dir = ROOT / 'backend' / 'models'
+    spec = importlib.util.spec_from_file_location(
+        'backend.models', package_dir / '_init.py', submodule_search_locations=[str(package_dir)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['backend.models'] = module
+    spec.loader.exec_module(module)
+
+_load_models_package()
+
+def _primary_key(row):
+    state = inspect(row, raiseerr=False)
+    if state is None:
+        return getattr(row, 'id', None)
+    key = state.mapper.primary_key_from_instance(row)
+    return key[0] if len(key) == 1 else tuple(key)
+
+class FakeQuery:
+    """Chainable stand-in for a Query; filters are ignored and the same rows come back"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *criteria):
+        return self
+
+    order_by = limit = group_by = filter
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def all(self):
+        return list(self.rows)
+
+    def get(self, key):
+        return next((row for row in self.rows if _primary_key(row) == key), None)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+class FakeSession:
+    """Session stand-in holding rows per queried entity
+
+    Rows are keyed by model name, or by column key for column queries
+    such as db.query(DocumentVersion.extracted_at).
+    """
+
+    def __init__(self, results=None):
+        self.results = {name: list(rows) for name, rows in (results or {}).items()}
+        self.added = []
+        self.commits = 0
+
+    def query(self, entity):
+        name = getattr(entity, 'key', None) or entity.__name__
+        return FakeQuery(self.results.setdefault(name, []))
+
+    def add(self, row):
+        self.added.append(row)
+        self.results.setdefault(type(row).__name__, []).append(row)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+@pytest.fixture
+def fake_session():
+    """Factory for FakeSession, e.g. fake_session({'CrawlUrl': [url]})"""
+    return FakeSession
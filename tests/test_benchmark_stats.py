@@ -0,0 +1,19 @@
+from backend.benchmarks.stats import latency_summary, percentile
+
+def test_percentile_is_nearest_rank():
+    assert percentile([1, 2], 50) == 1
+    assert percentile(list(range(1, 7)), 50) == 3
+    assert percentile(list(range(1, 11)), 50) == 5
+    assert percentile(list(range(1, 11)), 90) == 9
+    assert percentile(list(range(1, 11)), 99) == 10
+    assert percentile(list(range(1, 101)), 99) == 99
+
+def test_percentile_edges():
+    assert percentile([], 50) == 0.0
+    assert percentile([7], 50) == 7
+    assert percentile([3, 1, 2], 0) == 1
+    assert percentile([3, 1, 2], 100) == 3
+
+def test_latency_summary_reports_milliseconds():
+    summary = latency_summary([0.001 * i for i in range(1, 11)])
+    assert summary == {'p50_ms': 5.0, 'p90_ms': 9.0, 'p99_ms': 10.0, 'max_ms': 10.0}
@@ -0,0 +1,46 @@
+from backend.analysis.change_detector import ChangeDetector
+
+OLD = "We may share your data with partners.\nYou can opt out at any time.\n"
+NEW = "We may sell your data to partners.\nYou can opt out at any time.\nDisputes go to arbitration.\n"
+
+def rebuild(old_text: str, new_text: str, opcodes) -> str:
+    """Apply stored opcodes to the old text, copying equal runs from it"""
+    parts, position = [], 0
+    for _, i1, i2, j1, j2 in opcodes:
+        parts.append(old_text[position:i1])
+        parts.append(new_text[j1:j2])
+        position = i2
+    parts.append(old_text[position:])
+    return ''.join(parts)
+
+def test_identical_texts_have_no_opcodes():
+    diff = ChangeDetector().diff_opcodes(OLD, OLD)
+    assert diff['opcodes'] == []
+    assert diff['similarity'] == 1.0
+    assert diff['chars_added'] == diff['chars_removed'] == 0
+
+def test_opcodes_are_word_aligned_character_ranges():
+    diff = ChangeDetector().diff_opcodes(OLD, NEW)
+    assert [(tag, OLD[i1:i2], NEW[j1:j2]) for tag, i1, i2, j1, j2 in diff['opcodes']] == [
+        ('replace', "share ", "sell "),
+        ('replace', "with ", "to "),
+        ('insert', "", "Disputes go to arbitration.\n")
+    ]
+    assert diff['chars_removed'] == len("share with ")
+    assert diff['chars_added'] == len("sell to Disputes go to arbitration.\n")
+
+def test_opcodes_rebuild_the_new_text():
+    detector = ChangeDetector()
+    for old_text, new_text in [(OLD, NEW), (NEW, OLD), ("", NEW), (OLD, "")]:
+        opcodes = detector.diff_opcodes(old_text, new_text)['opcodes']
+        assert rebuild(old_text, new_text, opcodes) == new_text
+
+def test_expand_opcodes_rebuilds_the_changes():
+    detector = ChangeDetector()
+    changes = detector.expand_opcodes(NEW, OLD, detector.diff_opcodes(NEW, OLD)['opcodes'])
+    assert changes['additions'] == []
+    assert changes['deletions'] == ["Disputes go to arbitration.\n"]
+    assert changes['modifications'] == [
+        {'old': "sell ", 'new': "share "},
+        {'old': "to ", 'new': "with "}
+    ]
@@ -0,0 +1,67 @@
+import os
+from backend.analysis import clause_index
+from backend.analysis.clause_index import ClauseIndex, split_clauses
+
+SHARING = (
+    "We may share your personal information with our advertising partners and affiliates "
+    "for marketing purposes, and you may opt out of this sharing at any time in your settings."
+)
+SHARING_EDITED = SHARING.replace("at any time", "at any time and free of charge")
+ARBITRATION = (
+    "Any dispute arising out of these terms will be resolved by binding individual arbitration "
+    "rather than in court, and you waive any right to participate in a class action lawsuit."
+)
+
+def meta(document_id: str, company_id: str) -> dict:
+    return {'document_id': document_id, 'company_id': company_id}
+
+def test_split_clauses_groups_sentences_and_drops_fragments():
+    clauses = split_clauses(f"{SHARING}\n\nShort heading\n\n{ARBITRATION}", min_words=10)
+    assert clauses == [SHARING, ARBITRATION]
+
+def test_query_finds_near_duplicates_only():
+    index = ClauseIndex()
+    index.add_clause('a:0', SHARING, meta('A', 'acme'))
+    index.add_clause('b:0', ARBITRATION, meta('B', 'globex'))
+
+    matches = index.query(SHARING_EDITED, threshold=0.5)
+    assert [match['clause_id'] for match in matches] == ['a:0']
+    assert 0.5 <= matches[0]['similarity'] < 1.0
+    assert index.query(SHARING, exclude_company_id='acme') == []
+
+def test_remove_document_clears_its_buckets():
+    index = ClauseIndex()
+    index.add_clause('a:0', SHARING, meta('A', 'acme'))
+    index.remove_document('A')
+    assert index.query(SHARING) == []
+    assert not any(index.buckets)
+
+def test_save_and_load_round_trip(tmp_path):
+    index = ClauseIndex()
+    index.add_clause('a:0', SHARING, meta('A', 'acme'))
+    index.save(str(tmp_path / 'index.pkl'))
+
+    loaded = ClauseIndex.load(str(tmp_path / 'index.pkl'))
+    assert [match['clause_id'] for match in loaded.query(SHARING)] == ['a:0']
+    assert loaded.dirty_documents == set()
+
+def test_save_merges_changes_from_another_process(tmp_path, monkeypatch):
+    path = tmp_path / 'index.pkl'
+    monkeypatch.setenv('CLAUSE_INDEX_PATH', str(path))
+    monkeypatch.setattr(clause_index, '_clause_index', None)
+    monkeypatch.setattr(clause_index, '_loaded_mtime', None)
+
+    clause_index.get_clause_index().add_clause('a:0', SHARING, meta('A', 'acme'))
+    clause_index.save_clause_index()
+
+    # Another scraper process saves its own addition on top of the file
+    other = ClauseIndex.load(str(path))
+    other.add_clause('b:0', ARBITRATION, meta('B', 'globex'))
+    other.save(str(path))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+
+    clause_index.get_clause_index().add_clause('c:0', SHARING_EDITED, meta('C', 'initech'))
+    clause_index.save_clause_index()
+
+    merged = ClauseIndex.load(str(path))
+    assert set(merged.document_clauses) == {'A', 'B', 'C'}
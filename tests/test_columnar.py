@@ -0,0 +1,162 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+import logging
+import uuid
+import pytest
+from backend.bulk import columnar
+from backend.bulk.columnar import _merge_stage, _reference_exists, export_columns, load_watermarks
+
+T0 = datetime(2024, 6, 1, 12, tzinfo=timezone.utc)
+
+class FakeResult:
+    def __init__(self, rowcount=0, scalar=None, partitions=()):
+        self.rowcount = rowcount
+        self.value = scalar
+        self.chunks = list(partitions)
+
+    def scalar(self):
+        return self.value
+
+    def partitions(self, size):
+        return iter(self.chunks)
+
+class MergeConnection:
+    """Records merge statements; the merge affects `merged` of `staged` rows"""
+
+    def __init__(self, staged, merged):
+        self.staged = staged
+        self.merged = merged
+        self.statements = []
+
+    def execute(self, statement):
+        sql = str(statement)
+        self.statements.append(sql)
+        if sql.startswith('SELECT COUNT(*)'):
+            return FakeResult(scalar=self.staged)
+        return FakeResult(rowcount=self.merged)
+
+def test_reference_exists_checks_the_parent_table():
+    assert _reference_exists('documents', 'company_id', 'bulk_import_documents') == (
+        "(s.company_id IS NULL OR EXISTS (SELECT 1 FROM companies p WHERE p.id = s.company_id))"
+    )
+
+def test_self_reference_may_be_satisfied_from_the_stage():
+    condition = _reference_exists('companies', 'parent_company_id', 'bulk_import_companies')
+    assert 'EXISTS (SELECT 1 FROM companies p WHERE p.id = s.parent_company_id)' in condition
+    assert 'EXISTS (SELECT 1 FROM bulk_import_companies ps WHERE ps.id = s.parent_company_id)' in condition
+
+def test_deferred_pointer_guard_targets_the_pointed_table():
+    condition = _reference_exists('documents', 'current_version_id', 'bulk_import_documents')
+    assert 'FROM document_versions p WHERE p.id = s.current_version_id' in condition
+    assert 'bulk_import_documents ps' not in condition
+
+def test_full_rows_are_upserted_with_guards_and_without_deferred_pointers():
+    names = [column.name for column in export_columns('documents')]
+    connection = MergeConnection(staged=3, merged=3)
+    assert _merge_stage(connection, 'documents', 'bulk_import_documents', names) == 3
+
+    upsert = connection.statements[0]
+    inserted = upsert[upsert.index('(') + 1:upsert.index(')')].split(', ')
+    assert upsert.startswith('INSERT INTO documents')
+    assert 'current_version_id' not in inserted and 'latest_analysis_id' not in inserted
+    assert _reference_exists('documents', 'company_id', 'bulk_import_documents') in upsert
+    assert 'ON CONFLICT (id) DO UPDATE SET' in upsert
+
+def test_metadata_only_versions_update_existing_rows(caplog):
+    names = [column.name for column in export_columns('document_versions', include_content=False)]
+    connection = MergeConnection(staged=5, merged=2)
+    with caplog.at_level(logging.WARNING):
+        assert _merge_stage(connection, 'document_versions', 'bulk_import_document_versions', names) == 2
+
+    update = connection.statements[0]
+    assert update.startswith('UPDATE document_versions t SET')
+    assert 'content = ' not in update
+    assert 'WHERE t.id = s.id AND ' + _reference_exists(
+        'document_versions', 'document_id', 'bulk_import_document_versions'
+    ) in update
+    assert 'Skipped 3 of 5 document_versions rows' in caplog.text
+
+def test_load_watermarks_skips_tables_without_one(tmp_path):
+    manifest = tmp_path / 'manifest.json'
+    manifest.write_text(
+        '{"tables": {"companies": {"watermark": "2024-06-01T12:00:00+00:00"},'
+        ' "documents": {"watermark": null}}}'
+    )
+    assert load_watermarks(manifest) == {'companies': T0}
+
+class ExportConnection:
+    """Serves fixed row chunks to export_table and keeps the query it ran"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.queries = []
+
+    def execution_options(self, **options):
+        return self
+
+    def execute(self, query):
+        self.queries.append(query)
+        return FakeResult(partitions=self.chunks)
+
+    @contextmanager
+    def begin(self):
+        yield
+
+class ExportEngine:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def connect(self):
+        return self
+
+    def execution_options(self, **options):
+        return self
+
+    def __enter__(self):
+        return self.connection
+
+    def __exit__(self, *exc_info):
+        return False
+
+REQUIRED_VALUES = {str: 'example', int: 0, bool: False, datetime: T0, uuid.UUID: uuid.uuid4()}
+
+def company_row(updated_at):
+    values = {
+        column.name: None if column.nullable else REQUIRED_VALUES[column.type.python_type]
+        for column in export_columns('companies')
+    }
+    values.update(id=uuid.uuid4(), updated_at=updated_at)
+    return tuple(values.values())
+
+def since_bound(query):
+    return next(value for value in query.compile().params.values() if isinstance(value, datetime))
+
+def test_export_reads_behind_the_watermark_and_keeps_it_when_empty(tmp_path):
+    pytest.importorskip('pyarrow')
+    chunks = [[company_row(T0 + timedelta(minutes=5))], [company_row(T0 + timedelta(minutes=30))]]
+    connection = ExportConnection(chunks)
+    entry = columnar.export_table(connection, 'companies', tmp_path / 'companies.parquet', since=T0)
+    assert since_bound(connection.queries[0]) == T0 - columnar.WATERMARK_OVERLAP
+    assert entry['rows'] == 2
+    assert entry['watermark'] == (T0 + timedelta(minutes=30)).isoformat()
+
+    empty = columnar.export_table(ExportConnection([]), 'companies', tmp_path / 'empty.parquet', since=T0)
+    assert empty['rows'] == 0
+    assert empty['watermark'] == T0.isoformat()
+
+def test_incremental_exports_chain_through_the_manifest(tmp_path):
+    pytest.importorskip('pyarrow')
+    first = columnar.export_tables(
+        tmp_path / 'first', tables=['companies'], engine=ExportEngine(ExportConnection([[company_row(T0)]]))
+    )
+    assert first['tables']['companies']['watermark'] == T0.isoformat()
+
+    connection = ExportConnection([])
+    since = load_watermarks(tmp_path / 'first' / columnar.MANIFEST)
+    second = columnar.export_tables(
+        tmp_path / 'second', tables=['companies'], since=since,
+        overlap=timedelta(minutes=10), engine=ExportEngine(connection)
+    )
+    assert since_bound(connection.queries[0]) == T0 - timedelta(minutes=10)
+    assert second['overlap_seconds'] == 600
+    assert load_watermarks(tmp_path / 'second' / columnar.MANIFEST) == {'companies': T0}
@@ -0,0 +1,124 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from backend.models import RobotsCache
+from backend.scrapers.robots import RobotsPolicy, RobotsRules
+import pytest
+
+ROBOTS_TXT = """
+User-agent: *
+Disallow: /private/
+Crawl-delay: 2
+Sitemap: https://example.com/sitemap.xml
+"""
+
+class FakeScraper:
+    ROBOTS_USER_AGENT = 'EULAComparison'
+
+    def __init__(self, db, status=200, content=ROBOTS_TXT):
+        self.db = db
+        self.status = status
+        self.content = content
+        self.requests = []
+
+    async def _request(self, url, headers=None, binary=False):
+        self.requests.append(url)
+        return {'status': self.status, 'content': self.content, 'etag': None, 'last_modified': None}
+
+def load(scraper, url='https://example.com/terms'):
+    return asyncio.run(RobotsPolicy.load(scraper, url))
+
+@pytest.fixture
+def make_scraper(fake_session):
+    def make(status=200, content=ROBOTS_TXT, rows=()):
+        return FakeScraper(fake_session({'RobotsCache': rows}), status, content)
+    return make
+
+def cached_row(age: timedelta, status_code=200, content=ROBOTS_TXT) -> RobotsCache:
+    # psycopg2 returns timestamptz columns as aware datetimes
+    return RobotsCache(
+        origin='https://example.com',
+        status_code=status_code,
+        content=content,
+        fetched_at=datetime.now(timezone.utc) - age
+    )
+
+def test_load_fetches_and_parses_rules(make_scraper):
+    scraper = make_scraper()
+    policy = load(scraper)
+    assert scraper.requests == ['https://example.com/robots.txt']
+    assert policy.allowed('https://example.com/terms')
+    assert not policy.allowed('https://example.com/private/page')
+    assert policy.crawl_delay == 2.0
+    assert policy.sitemaps == ['https://example.com/sitemap.xml']
+
+def test_second_load_uses_existing_cache_row(make_scraper):
+    scraper = make_scraper()
+    load(scraper)
+    policy = load(scraper)
+    assert len(scraper.requests) == 1
+    assert not policy.allowed('https://example.com/private/page')
+
+def test_fresh_aware_cache_row_is_not_refetched(make_scraper):
+    scraper = make_scraper(rows=[cached_row(timedelta(hours=1))])
+    policy = load(scraper)
+    assert scraper.requests == []
+    assert policy.allowed('https://example.com/terms')
+
+def test_stale_cache_row_is_refetched(make_scraper):
+    scraper = make_scraper(content="User-agent: *\nDisallow: /\n", rows=[cached_row(timedelta(days=2))])
+    policy = load(scraper)
+    assert scraper.requests == ['https://example.com/robots.txt']
+    assert not policy.allowed('https://example.com/terms')
+
+def test_missing_robots_allows_everything(make_scraper):
+    policy = load(make_scraper(status=404, content=None))
+    assert policy.allowed('https://example.com/private/page')
+
+def test_server_error_is_unavailable_and_cached_briefly(make_scraper):
+    scraper = make_scraper(status=503, content=None)
+    policy = load(scraper)
+    assert policy.unavailable
+    assert not policy.allowed('https://example.com/terms')
+
+    scraper.db.query(RobotsCache).get('https://example.com').fetched_at -= timedelta(hours=1)
+    load(scraper)
+    assert len(scraper.requests) == 2
+
+def test_network_failure_is_unavailable(make_scraper):
+    assert load(make_scraper(status=None, content=None)).unavailable
+
+def test_disallow_rules_are_not_unavailable(make_scraper):
+    policy = load(make_scraper(content="User-agent: *\nDisallow: /\n"))
+    assert not policy.unavailable
+    assert not policy.allowed('https://example.com/terms')
+
+def test_longest_match_wins_over_rule_order():
+    rules = RobotsRules("User-agent: *\nDisallow: /\nAllow: /terms\n")
+    assert rules.allowed('EULAComparison', 'https://example.com/terms')
+    assert rules.allowed('EULAComparison', 'https://example.com/terms/privacy')
+    assert not rules.allowed('EULAComparison', 'https://example.com/about')
+
+def test_allow_wins_equal_length_ties():
+    rules = RobotsRules("User-agent: *\nDisallow: /legal\nAllow: /legal\n")
+    assert rules.allowed('EULAComparison', 'https://example.com/legal')
+
+def test_wildcards_and_end_anchor():
+    rules = RobotsRules("User-agent: *\nDisallow: /*.pdf$\nDisallow: /*/print\n")
+    assert not rules.allowed('EULAComparison', 'https://example.com/a.pdf')
+    assert rules.allowed('EULAComparison', 'https://example.com/a.pdf?download=1')
+    assert not rules.allowed('EULAComparison', 'https://example.com/legal/print')
+    assert rules.allowed('EULAComparison', 'https://example.com/legal/terms')
+
+def test_specific_agent_group_replaces_the_wildcard_group():
+    rules = RobotsRules(
+        "User-agent: *\nDisallow: /\n\n"
+        "User-agent: Other\nUser-agent: EULAComparison\nDisallow: /private\nCrawl-delay: 5\n"
+    )
+    assert rules.allowed('EULAComparison', 'https://example.com/terms')
+    assert not rules.allowed('EULAComparison', 'https://example.com/private')
+    assert not rules.allowed('SomeoneElse', 'https://example.com/terms')
+    assert rules.crawl_delay('EULAComparison') == 5.0
+    assert rules.crawl_delay('SomeoneElse') is None
+
+def test_robots_txt_itself_is_always_allowed():
+    assert RobotsRules("User-agent: *\nDisallow: /\n").allowed('EULAComparison', 'https://example.com/robots.txt')
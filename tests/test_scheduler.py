@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import uuid
+from backend.models import CrawlUrl
+from backend.scrapers.frontier import CrawlFrontier
+from backend.scrapers.scheduler import CrawlScheduler
+
+NOW = datetime(2024, 6, 1, 12, tzinfo=timezone.utc)
+DAY = timedelta(days=1)
+
+def company(frequency='weekly', min_hours=6, max_hours=720):
+    return SimpleNamespace(
+        id='company',
+        scraping_frequency=frequency,
+        min_crawl_interval_hours=min_hours,
+        max_crawl_interval_hours=max_hours
+    )
+
+def entry(interval=None, document_id=None, failure_count=0):
+    return CrawlUrl(
+        url='https://example.com/terms',
+        revisit_interval_seconds=int(interval.total_seconds()) if interval else None,
+        document_id=document_id,
+        failure_count=failure_count
+    )
+
+def test_first_fetch_without_history_uses_company_frequency(fake_session):
+    scheduler = CrawlScheduler(fake_session(), company('daily'))
+    url = entry()
+    scheduler.record_first_fetch(url, NOW)
+    assert url.revisit_interval_seconds == DAY.total_seconds()
+    assert url.next_due_at == NOW + DAY
+
+def test_first_fetch_seeds_from_version_history(fake_session):
+    extracted = [(NOW - DAY * days,) for days in (0, 4, 8, 20)]
+    scheduler = CrawlScheduler(fake_session({'extracted_at': extracted}), company())
+    url = entry(document_id=uuid.uuid4())
+    scheduler.record_first_fetch(url, NOW)
+    # median gap of 4, 4 and 12 days, halved
+    assert url.next_due_at == NOW + 2 * DAY
+
+def test_unchanged_backs_off_exponentially_up_to_max(fake_session):
+    scheduler = CrawlScheduler(fake_session(), company(max_hours=24 * 20))
+    url = entry(interval=4 * DAY)
+    scheduler.record_unchanged(url, NOW)
+    assert url.next_due_at == NOW + 8 * DAY
+    scheduler.record_unchanged(url, NOW)
+    assert url.next_due_at == NOW + 16 * DAY
+    scheduler.record_unchanged(url, NOW)
+    assert url.next_due_at == NOW + 20 * DAY
+
+def test_changed_without_history_halves_down_to_min(fake_session):
+    scheduler = CrawlScheduler(fake_session(), company(min_hours=12))
+    url = entry(interval=DAY)
+    scheduler.record_changed(url, NOW)
+    assert url.next_due_at == NOW + timedelta(hours=12)
+    scheduler.record_changed(url, NOW)
+    assert url.next_due_at == NOW + timedelta(hours=12)
+
+def test_changed_with_history_uses_half_the_observed_gap(fake_session):
+    extracted = [(NOW - DAY * days,) for days in (0, 6, 12)]
+    scheduler = CrawlScheduler(fake_session({'extracted_at': extracted}), company())
+    url = entry(interval=30 * DAY, document_id=uuid.uuid4())
+    scheduler.record_changed(url, NOW)
+    assert url.next_due_at == NOW + 3 * DAY
+
+def test_changed_never_loosens_a_tighter_schedule(fake_session):
+    extracted = [(NOW - DAY * days,) for days in (0, 60, 120)]
+    scheduler = CrawlScheduler(fake_session({'extracted_at': extracted}), company(min_hours=1))
+    url = entry(interval=DAY, document_id=uuid.uuid4())
+    scheduler.record_changed(url, NOW)
+    assert url.next_due_at == NOW + DAY / 2
+
+def test_failures_retry_quickly_without_changing_the_interval(fake_session):
+    scheduler = CrawlScheduler(fake_session(), company())
+    url = entry(interval=2 * DAY, failure_count=3)
+    scheduler.record_failed(url, NOW)
+    assert url.next_due_at == NOW + timedelta(minutes=15 * 8)
+    assert url.revisit_interval_seconds == (2 * DAY).total_seconds()
+
+    url.failure_count = 10
+    scheduler.record_failed(url, NOW)
+    assert url.next_due_at == NOW + 2 * DAY
+
+def test_disallowed_waits_for_the_max_interval(fake_session):
+    scheduler = CrawlScheduler(fake_session(), company(max_hours=48))
+    url = entry()
+    scheduler.record_disallowed(url, NOW)
+    assert url.next_due_at == NOW + 2 * DAY
+
+def test_newer_sitemap_lastmod_makes_a_fetched_url_due(fake_session):
+    # Values as read back from timestamptz columns and parse_lastmod: both aware
+    url = entry(interval=30 * DAY)
+    url.last_fetched_at = NOW - 10 * DAY
+    url.next_due_at = NOW + 20 * DAY
+    frontier = CrawlFrontier(fake_session({'Company': [company()], 'CrawlUrl': [url]}), 'company')
+    frontier.add(url.url, 'sitemap', NOW - DAY)
+    assert url.next_due_at <= datetime.now(timezone.utc)
+    assert url.sitemap_lastmod == NOW - DAY
+
+def test_older_sitemap_lastmod_keeps_the_schedule(fake_session):
+    url = entry(interval=30 * DAY)
+    url.last_fetched_at = NOW - DAY
+    url.next_due_at = NOW + 20 * DAY
+    frontier = CrawlFrontier(fake_session({'Company': [company()], 'CrawlUrl': [url]}), 'company')
+    frontier.add(url.url, 'sitemap', NOW - 10 * DAY)
+    assert url.next_due_at == NOW + 20 * DAY
@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+import uuid
+from backend.search import PostgresSearchBackend, SearchBackend, SearchIndexer, get_search_backend
+from backend.search import es_backend
+from backend.search import indexer as search_indexer
+
+class RecordingBackend(SearchBackend):
+    transactional = False
+
+    def __init__(self):
+        self.indexed = []
+
+    def index_version(self, entry):
+        self.indexed.append(entry['document_version_id'])
+
+    def bulk_index(self, entries):
+        return 0
+
+    def search(self, query, company_id=None, document_type=None, page=1, page_size=20):
+        return {}
+
+def version():
+    document = SimpleNamespace(id=uuid.uuid4(), company_id=uuid.uuid4(), document_type='privacy_policy', title='Privacy')
+    return SimpleNamespace(id=uuid.uuid4(), document=document, content='We collect data.')
+
+def test_external_backend_writes_only_after_flush(fake_session):
+    backend = RecordingBackend()
+    indexer = SearchIndexer(fake_session(), backend)
+    v = version()
+    indexer.index_version(v)
+    assert backend.indexed == []
+    indexer.flush()
+    assert backend.indexed == [str(v.id)]
+    indexer.flush()
+    assert backend.indexed == [str(v.id)]
+
+def test_discard_drops_rolled_back_versions(fake_session):
+    backend = RecordingBackend()
+    indexer = SearchIndexer(fake_session(), backend)
+    indexer.index_version(version())
+    indexer.discard()
+    indexer.flush()
+    assert backend.indexed == []
+
+class FakeResult:
+    def __init__(self, rows=(), scalar=None):
+        self.rows = list(rows)
+        self.value = scalar
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+    def scalar(self):
+        return self.value
+
+class SearchSession:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        return self.results.pop(0)
+
+def test_postgres_total_survives_pages_past_the_end():
+    db = SearchSession(FakeResult(), FakeResult(scalar=42))
+    response = PostgresSearchBackend(db).search('arbitration', page=5)
+    assert response['total'] == 42
+    assert response['results'] == []
+    assert 'COUNT(*)' in db.statements[1]
+
+def test_postgres_empty_first_page_skips_the_count():
+    db = SearchSession(FakeResult())
+    assert PostgresSearchBackend(db).search('arbitration')['total'] == 0
+    assert len(db.statements) == 1
+
+def test_elasticsearch_backend_is_built_once(monkeypatch):
+    built = []
+    monkeypatch.setenv('SEARCH_BACKEND', 'elasticsearch')
+    monkeypatch.setattr(es_backend, 'ElasticsearchSearchBackend', lambda: built.append(1) or object())
+    search_indexer._elasticsearch_backend.cache_clear()
+    try:
+        assert get_search_backend(None) is get_search_backend(None)
+        assert len(built) == 1
+    finally:
+        search_indexer._elasticsearch_backend.cache_clear()
@@ -0,0 +1,51 @@
+import gzip
+from datetime import datetime, timezone
+from backend.scrapers.sitemap import parse_lastmod, parse_sitemap
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc> https://example.com/terms </loc><lastmod>2024-03-01T12:00:00+02:00</lastmod></url>
+  <url><loc>https://example.com/privacy</loc></url>
+  <url><lastmod>2024-03-01</lastmod></url>
+</urlset>
+"""
+
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/sitemap-legal.xml</loc><lastmod>2024-01-01</lastmod></sitemap>
+</sitemapindex>
+"""
+
+def test_parse_lastmod_normalizes_to_aware_utc():
+    assert parse_lastmod('2024-03-01T12:00:00+02:00') == datetime(2024, 3, 1, 10, tzinfo=timezone.utc)
+    assert parse_lastmod('2024-03-01T10:00:00Z') == datetime(2024, 3, 1, 10, tzinfo=timezone.utc)
+    assert parse_lastmod('2024-03-01') == datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+def test_parse_lastmod_rejects_missing_and_invalid_values():
+    assert parse_lastmod(None) is None
+    assert parse_lastmod('') is None
+    assert parse_lastmod('last tuesday') is None
+
+def test_parse_urlset():
+    pages, children = parse_sitemap(URLSET)
+    assert pages == [
+        ('https://example.com/terms', datetime(2024, 3, 1, 10, tzinfo=timezone.utc)),
+        ('https://example.com/privacy', None)
+    ]
+    assert children == []
+
+def test_parse_sitemap_index():
+    pages, children = parse_sitemap(SITEMAP_INDEX)
+    assert pages == []
+    assert children == ['https://example.com/sitemap-legal.xml']
+
+def test_parse_gzipped_sitemap():
+    pages, _ = parse_sitemap(gzip.compress(URLSET))
+    assert [loc for loc, _ in pages] == ['https://example.com/terms', 'https://example.com/privacy']
+
+def test_parse_sitemap_without_namespace():
+    pages, _ = parse_sitemap(b"<urlset><url><loc>https://example.com/eula</loc></url></urlset>")
+    assert pages == [('https://example.com/eula', None)]
+
+def test_invalid_sitemap_is_empty():
+    assert parse_sitemap(b"<html>not a sitemap") == ([], [])